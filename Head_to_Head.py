@@ -3,12 +3,15 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-from models import connect_to_db
+from models import get_pool, load_store
 from constants import MAIN_MENU_OPTIONS
 from controllers import redirect_controller
 
 
-# Connect to db
-cnx = connect_to_db()
+# Shared connection pool, reused across reruns and sessions
+cnx = get_pool()
+
+# Columnar copy of the tables, loaded once per process
+load_store(cnx)
 
 redirect_controller(MAIN_MENU_OPTIONS[0], cnx)
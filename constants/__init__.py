@@ -1 +1,11 @@
-from .data import MAIN_MENU_OPTIONS, MATCHES_COL, PLAYERS_COL
+from .data import (
+    MAIN_MENU_OPTIONS,
+    MATCHES_COL,
+    PLAYERS_COL,
+    MATCHES_ID_COL,
+    PLAYERS_ID_COL,
+    INNINGS_COL,
+    POWERPLAY_OVERS,
+    FRANCHISE_ALIASES,
+    FRANCHISE_HOME_CITIES,
+)
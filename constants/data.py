@@ -3,6 +3,7 @@ MAIN_MENU_OPTIONS = ["Head to Head comparison", "Team Analysis"]
 MATCHES_COL = [
     "id",
     "season",
+    "season_key",
     "city",
     "date",
     "match_type",
@@ -42,3 +43,50 @@ PLAYERS_COL = [
     "dismissal_kind",
     "fielder",
 ]
+
+# Integer franchise id columns written by the ingest step in models.franchises
+MATCHES_ID_COL = ["team1_id", "team2_id", "toss_winner_id", "winner_id"]
+
+PLAYERS_ID_COL = ["batting_team_id", "bowling_team_id"]
+
+# Innings totals fact table built from deliveries by models.summary and the
+# data store
+INNINGS_COL = [
+    "match_id",
+    "inning",
+    "batting_team_id",
+    "runs",
+    "wickets",
+    "legal_balls",
+    "extras",
+    "powerplay_runs",
+]
+
+# Overs (counted from 0) in the powerplay
+POWERPLAY_OVERS = 6
+
+# Former franchise names mapped to the name they play under now
+FRANCHISE_ALIASES = {
+    "Royal Challengers Bengaluru": "Royal Challengers Bangalore",
+    "Kings XI Punjab": "Punjab Kings",
+    "Rising Pune Supergiant": "Rising Pune Supergiants",
+    "Delhi Daredevils": "Delhi Capitals",
+}
+
+FRANCHISE_HOME_CITIES = {
+    "Royal Challengers Bangalore": "Bangalore",
+    "Punjab Kings": "Chandigarh",
+    "Delhi Capitals": "Delhi",
+    "Mumbai Indians": "Mumbai",
+    "Kolkata Knight Riders": "Kolkata",
+    "Rajasthan Royals": "Jaipur",
+    "Deccan Chargers": "Hyderabad",
+    "Chennai Super Kings": "Chennai",
+    "Kochi Tuskers Kerala": "Kochi",
+    "Pune Warriors": "Pune",
+    "Sunrisers Hyderabad": "Hyderabad",
+    "Gujarat Lions": "Rajkot",
+    "Rising Pune Supergiants": "Pune",
+    "Lucknow Super Giants": "Lucknow",
+    "Gujarat Titans": "Ahmedabad",
+}
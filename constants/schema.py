@@ -0,0 +1,112 @@
+import pandas as pd
+
+# Names repeat across thousands of rows, so they are stored as categoricals;
+# per-ball counters fit in int8. Season labels stay plain strings; filters
+# use the integer season_key instead.
+MATCHES_DTYPES = {
+    "id": "int32",
+    "season": "object",
+    "season_key": "int16",
+    "city": "category",
+    "date": "object",
+    "match_type": "category",
+    "player_of_match": "category",
+    "venue": "category",
+    "team1": "category",
+    "team2": "category",
+    "toss_winner": "category",
+    "toss_decision": "category",
+    "winner": "category",
+    "result": "category",
+    "result_margin": "float32",
+    "target_runs": "float32",
+    "target_overs": "float64",
+    "super_over": "category",
+    "method": "category",
+    "umpire1": "category",
+    "umpire2": "category",
+    "team1_id": "int16",
+    "team2_id": "int16",
+    "toss_winner_id": "int16",
+    "winner_id": "float32",
+}
+
+PLAYERS_DTYPES = {
+    "match_id": "int32",
+    "inning": "int8",
+    "batting_team": "category",
+    "bowling_team": "category",
+    "over": "int8",
+    "ball": "int8",
+    "batter": "category",
+    "bowler": "category",
+    "non_striker": "category",
+    "batsman_runs": "int8",
+    "extra_runs": "int8",
+    "total_runs": "int8",
+    "extras_type": "category",
+    "is_wicket": "int8",
+    "player_dismissed": "category",
+    "dismissal_kind": "category",
+    "fielder": "category",
+    "batting_team_id": "int16",
+    "bowling_team_id": "int16",
+}
+
+INNINGS_DTYPES = {
+    "match_id": "int32",
+    "inning": "int8",
+    "batting_team_id": "int16",
+    "runs": "int16",
+    "wickets": "int8",
+    "legal_balls": "int16",
+    "extras": "int16",
+    "powerplay_runs": "int16",
+}
+
+SCHEMA = {**MATCHES_DTYPES, **PLAYERS_DTYPES, **INNINGS_DTYPES}
+
+
+def apply_schema(df, categorical=True):
+    """Cast the known columns of a frame to their declared dtypes
+
+    Args:
+        df (pd.DataFrame): frame with MATCHES_COL, PLAYERS_COL and/or INNINGS_COL columns
+        categorical (bool): also convert name columns to categoricals
+
+    Returns:
+        pd.DataFrame: frame with compact dtypes
+    """
+    dtypes = {
+        col: SCHEMA[col]
+        for col in df.columns.unique()
+        if col in SCHEMA and (categorical or SCHEMA[col] != "category")
+    }
+    return df.astype(dtypes)
+
+
+def make_frame(data, columns):
+    """Build a frame from query rows or column arrays with the declared dtypes
+
+    Args:
+        data (list | dict): rows or column name -> array
+        columns (list): column names
+
+    Returns:
+        pd.DataFrame: frame with compact dtypes
+    """
+    return apply_schema(pd.DataFrame(data, columns=columns))
+
+
+def decategorize(df):
+    """Cast categorical columns of a small result frame back to object, so
+    templates can concatenate and format them like plain strings
+
+    Args:
+        df (pd.DataFrame): result frame
+
+    Returns:
+        pd.DataFrame: frame without categorical columns
+    """
+    categorical = df.select_dtypes("category").columns
+    return df.astype({col: object for col in categorical}) if len(categorical) else df
@@ -1,7 +1,9 @@
 from constants import MAIN_MENU_OPTIONS
+from utils import query_metrics
 
 from templates import team_analysis
 from templates import head_to_head_screen
+from templates import show_query_metrics
 
 
 def redirect_controller(menu, cnx):
@@ -9,10 +11,14 @@ def redirect_controller(menu, cnx):
 
     Args:
         menu (sttring): menu option selected
-        cnx (_type_): connection obect
+        cnx (ConnectionPool): connection pool
     """
-    if menu == MAIN_MENU_OPTIONS[0]:
-        head_to_head_screen(cnx)
+    # Queries run while a screen renders are recorded under its menu option
+    with query_metrics.screen(menu):
+        if menu == MAIN_MENU_OPTIONS[0]:
+            head_to_head_screen(cnx)
 
-    elif menu == MAIN_MENU_OPTIONS[1]:
-        team_analysis(cnx)
+        elif menu == MAIN_MENU_OPTIONS[1]:
+            team_analysis(cnx)
+
+    show_query_metrics(menu)
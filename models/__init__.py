@@ -1 +1,3 @@
-from .conn import connect_to_db
\ No newline at end of file
+from .conn import connect_to_db
+from .pool import ConnectionPool, get_pool
+from .store import DataStore, get_store, load_store
\ No newline at end of file
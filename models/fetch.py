@@ -0,0 +1,148 @@
+import os
+
+import numpy as np
+import pandas as pd
+from pymysql.cursors import SSCursor
+
+from constants.schema import SCHEMA
+
+FETCH_CHUNK_ROWS = int(os.getenv("FETCH_CHUNK_ROWS", 10000))
+
+
+def _buffer_dtype(dtypes, column):
+    dtype = dtypes.get(column, "object")
+    return np.dtype(object if dtype == "category" else dtype)
+
+
+def _store(buffers, column, start, values):
+    try:
+        buffers[column][start : start + len(values)] = values
+    except (TypeError, ValueError, OverflowError):
+        # NULLs in an integer column, or values that do not fit the declared
+        # dtype: fall back to float (NULL -> NaN), then to object
+        widened = np.float64 if buffers[column].dtype.kind in "iub" else object
+        if buffers[column].dtype == widened:
+            widened = object
+        buffers[column] = buffers[column].astype(widened)
+        _store(buffers, column, start, values)
+
+
+def read_frame(
+    conn,
+    query,
+    params=None,
+    columns=None,
+    dtypes=SCHEMA,
+    categorical=True,
+    size_hint=None,
+    chunk_rows=FETCH_CHUNK_ROWS,
+):
+    """Stream a query's rows from a server-side cursor straight into typed
+    NumPy column buffers and wrap them in a DataFrame, without building the
+    whole result as Python tuples first.
+
+    Buffers take their dtype from dtypes (object for names and unknown
+    columns) and grow by doubling; only one fetchmany chunk of rows
+    is alive at a time.
+
+    Args:
+        conn (Connection): pooled connection
+        query (str): query
+        params (tuple | dict): query parameters
+        columns (list): frame column names, by default the cursor's
+        dtypes (dict): column -> dtype, constants.schema by default; pass {}
+            for aggregates whose names clash with the per-ball columns
+        categorical (bool): convert name columns to categoricals
+        size_hint (int): expected row count, to allocate the buffers once
+        chunk_rows (int): rows per fetchmany
+
+    Returns:
+        pd.DataFrame: one column per selected column
+    """
+    with conn.cursor(SSCursor) as cursor:
+        cursor.execute(query, params)
+        if columns is None:
+            columns = [column[0] for column in cursor.description]
+
+        capacity = max(size_hint or 0, chunk_rows, 1)
+        buffers = {
+            col: np.empty(capacity, dtype=_buffer_dtype(dtypes, col)) for col in columns
+        }
+        size = 0
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            if size + len(rows) > capacity:
+                capacity = max(capacity * 2, size + len(rows))
+                for col, buffer in buffers.items():
+                    grown = np.empty(capacity, dtype=buffer.dtype)
+                    grown[:size] = buffer[:size]
+                    buffers[col] = grown
+            for col, values in zip(columns, zip(*rows)):
+                _store(buffers, col, size, values)
+            size += len(rows)
+
+    # Trimming copies the typed values once so the spare capacity is freed
+    return _frame(
+        {
+            col: buffer if size == capacity else buffer[:size].copy()
+            for col, buffer in buffers.items()
+        },
+        columns,
+        dtypes,
+        categorical,
+    )
+
+
+def iter_frames(
+    conn,
+    query,
+    params=None,
+    columns=None,
+    dtypes=SCHEMA,
+    categorical=False,
+    chunk_rows=FETCH_CHUNK_ROWS,
+):
+    """Stream a query's rows from a server-side cursor as one typed
+    DataFrame per fetchmany chunk, so memory is bounded by chunk_rows
+    however large the result is. The connection stays busy until the
+    generator is exhausted or closed.
+
+    Args:
+        conn (Connection): pooled connection
+        query (str): query
+        params (tuple | dict): query parameters
+        columns (list): frame column names, by default the cursor's
+        dtypes (dict): column -> dtype, as in read_frame
+        categorical (bool): convert name columns to categoricals; off by
+            default so consecutive chunks concatenate cheaply
+        chunk_rows (int): rows per chunk
+
+    Yields:
+        pd.DataFrame: up to chunk_rows rows
+    """
+    with conn.cursor(SSCursor) as cursor:
+        cursor.execute(query, params)
+        if columns is None:
+            columns = [column[0] for column in cursor.description]
+
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            buffers = {
+                col: np.empty(len(rows), dtype=_buffer_dtype(dtypes, col))
+                for col in columns
+            }
+            for col, values in zip(columns, zip(*rows)):
+                _store(buffers, col, 0, values)
+            yield _frame(buffers, columns, dtypes, categorical)
+
+
+def _frame(buffers, columns, dtypes, categorical):
+    df = pd.DataFrame(buffers, columns=columns, copy=False)
+    if categorical:
+        names = [col for col in columns if dtypes.get(col) == "category"]
+        df = df.astype({col: "category" for col in names})
+    return df
@@ -0,0 +1,276 @@
+import threading
+
+from constants import FRANCHISE_ALIASES
+from .snapshot import FRANCHISES_QUERY, invalidate_snapshot
+from .store import franchise_lookup, get_store
+
+# Team-name columns and the franchise id column written next to each
+TEAM_COLUMNS = {
+    "matches": {
+        "team1": "team1_id",
+        "team2": "team2_id",
+        "toss_winner": "toss_winner_id",
+        "winner": "winner_id",
+    },
+    "deliveries": {
+        "batting_team": "batting_team_id",
+        "bowling_team": "bowling_team_id",
+    },
+}
+
+CREATE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS franchises (
+        id SMALLINT NOT NULL AUTO_INCREMENT,
+        name VARCHAR(64) NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE KEY uq_franchises_name (name)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS franchise_aliases (
+        alias VARCHAR(64) NOT NULL,
+        franchise_id SMALLINT NOT NULL,
+        PRIMARY KEY (alias)
+    )
+    """,
+]
+
+
+# A new team name becomes a franchise of its own, as in ingest_franchises
+TEAM_ID_TRIGGER_STATEMENTS = """
+    INSERT IGNORE INTO franchises (name)
+        SELECT NEW.{name} FROM DUAL WHERE NEW.{name} IS NOT NULL
+        AND NOT EXISTS (SELECT 1 FROM franchise_aliases WHERE alias = NEW.{name});
+    INSERT IGNORE INTO franchise_aliases (alias, franchise_id)
+        SELECT NEW.{name}, id FROM franchises WHERE name = NEW.{name};
+    SET NEW.{id} = (
+        SELECT franchise_id FROM franchise_aliases WHERE alias = NEW.{name}
+    );
+    SET NEW.{name} = COALESCE(
+        (SELECT name FROM franchises WHERE id = NEW.{id}), NEW.{name}
+    );
+"""
+
+
+def team_id_triggers():
+    """BEFORE INSERT triggers that key and rename the team columns of new
+    rows, so rows loaded after ingest_franchises never carry NULL ids
+
+    Returns:
+        dict: trigger name -> CREATE TRIGGER statement
+    """
+    triggers = {}
+    for table, columns in TEAM_COLUMNS.items():
+        body = "".join(
+            TEAM_ID_TRIGGER_STATEMENTS.format(name=name_column, id=id_column)
+            for name_column, id_column in columns.items()
+        )
+        triggers[f"{table}_franchise_ids"] = (
+            f"CREATE TRIGGER {table}_franchise_ids BEFORE INSERT ON {table} "
+            f"FOR EACH ROW BEGIN {body} END"
+        )
+    return triggers
+
+
+def ingest_franchises(cnx):
+    """Build the franchise dimension and write franchise ids next to every
+    team-name column, renaming former franchise names to the current ones.
+
+    Later inserts are keyed by the team_id_triggers this creates; re-running
+    is safe and catches up rows loaded before the triggers existed.
+
+    Args:
+        cnx (ConnectionPool): connection pool
+    """
+    with cnx.connection() as conn:
+        cursor = conn.cursor()
+        for statement in CREATE_TABLES:
+            cursor.execute(statement)
+
+        names = set()
+        for table, columns in TEAM_COLUMNS.items():
+            for column in columns:
+                cursor.execute(f"SELECT DISTINCT {column} FROM {table}")
+                names.update(row[0] for row in cursor.fetchall() if row[0])
+
+        cursor.executemany(
+            "INSERT IGNORE INTO franchises (name) VALUES (%s)",
+            sorted({FRANCHISE_ALIASES.get(name, name) for name in names}),
+        )
+        cursor.executemany(
+            "REPLACE INTO franchise_aliases (alias, franchise_id) "
+            "SELECT %s, id FROM franchises WHERE name = %s",
+            [(name, FRANCHISE_ALIASES.get(name, name)) for name in sorted(names)],
+        )
+
+        for table, columns in TEAM_COLUMNS.items():
+            cursor.execute(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_schema = DATABASE() AND table_name = %s",
+                (table,),
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            for name_column, id_column in columns.items():
+                if id_column not in existing:
+                    cursor.execute(
+                        f"ALTER TABLE {table} ADD COLUMN {id_column} SMALLINT NULL"
+                    )
+                cursor.execute(
+                    f"UPDATE {table} t "
+                    f"INNER JOIN franchise_aliases a ON t.{name_column} = a.alias "
+                    f"INNER JOIN franchises f ON a.franchise_id = f.id "
+                    f"SET t.{id_column} = f.id, t.{name_column} = f.name"
+                )
+                print(f"{table}.{name_column} mapped to {id_column}")
+
+        cursor.execute(
+            "SELECT trigger_name FROM information_schema.triggers "
+            "WHERE trigger_schema = DATABASE()"
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        for name, statement in team_id_triggers().items():
+            if name not in existing:
+                print(f"Creating trigger {name}")
+                cursor.execute(statement)
+
+        conn.commit()
+
+    # Names were rewritten in place, which the row-count fingerprint cannot see
+    invalidate_snapshot()
+    reset_franchises()
+
+
+def verify_franchises(cnx):
+    """Franchise tables and id columns that ingest_franchises has not
+    created, and id columns with rows it has not keyed
+
+    Args:
+        cnx (ConnectionPool): connection pool
+
+    Returns:
+        list: missing "table" and "table.column" names, and
+        "table.column (n NULL)" for unkeyed rows
+    """
+    with cnx.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT table_name, column_name FROM information_schema.columns "
+            "WHERE table_schema = DATABASE()"
+        )
+        existing = {(table, column) for table, column in cursor.fetchall()}
+        tables = {table for table, _ in existing}
+
+        missing = [
+            table
+            for table in ("franchises", "franchise_aliases")
+            if table not in tables
+        ]
+        for table, columns in TEAM_COLUMNS.items():
+            absent = [
+                id_column
+                for id_column in columns.values()
+                if (table, id_column) not in existing
+            ]
+            missing.extend(f"{table}.{id_column}" for id_column in absent)
+            present = {
+                name: id_column
+                for name, id_column in columns.items()
+                if id_column not in absent
+            }
+            if not present:
+                continue
+            # A named team without an id was loaded after the last ingest
+            cursor.execute(
+                "SELECT "
+                + ", ".join(
+                    f"SUM({name} IS NOT NULL AND {id_column} IS NULL)"
+                    for name, id_column in present.items()
+                )
+                + f" FROM {table}"
+            )
+            for id_column, unkeyed in zip(present.values(), cursor.fetchone()):
+                if unkeyed:
+                    missing.append(f"{table}.{id_column} ({int(unkeyed)} NULL)")
+    return missing
+
+
+def require_franchises(cnx):
+    """Fail fast when the franchise ids every query filters on are missing
+    or some rows have none. Checked once per process.
+
+    Args:
+        cnx (ConnectionPool): connection pool
+
+    Raises:
+        RuntimeError: naming what is missing and how to create it
+    """
+    global _verified
+    if _verified:
+        return
+    missing = verify_franchises(cnx)
+    if missing:
+        raise RuntimeError(
+            f"Franchise ids are missing ({', '.join(missing)}); "
+            "run `python -m models.franchises` against this database"
+        )
+    _verified = True
+
+
+_verified = False
+_franchises = None
+_franchises_lock = threading.Lock()
+
+
+def get_franchises(cnx):
+    """Franchise lookup, read once per process
+
+    Args:
+        cnx (ConnectionPool): connection pool
+
+    Returns:
+        dict: "ids" maps every known team name to its franchise id, "names"
+        maps each franchise id to its current name
+    """
+    global _franchises
+    store = get_store()
+    if store.loaded:
+        return store.franchises
+
+    with _franchises_lock:
+        if _franchises is None:
+            with cnx.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(FRANCHISES_QUERY)
+                _franchises = franchise_lookup(cursor.fetchall())
+        return _franchises
+
+
+def get_franchise_id(cnx, team):
+    """Franchise id of a team under any of its names
+
+    Args:
+        cnx (ConnectionPool): connection pool
+        team (str): team name
+
+    Returns:
+        int: franchise id, or None for an unknown team
+    """
+    return get_franchises(cnx)["ids"].get(team)
+
+
+def reset_franchises():
+    """Forget the cached lookup so the next call re-reads it"""
+    global _franchises
+    with _franchises_lock:
+        _franchises = None
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    from models import get_pool
+
+    ingest_franchises(get_pool())
@@ -0,0 +1,307 @@
+import sys
+
+import pandas as pd
+
+from .snapshot import invalidate_snapshot
+
+# (table, column, definition) added to the source tables
+COLUMNS = [
+    ("matches", "season_key", "SMALLINT NULL"),
+]
+
+# Season labels such as "2007/08" do not sort as strings; key each season by
+# the calendar year its first match was played in
+SEASON_KEY_BACKFILL = """
+    UPDATE matches m
+    INNER JOIN (
+        SELECT season, YEAR(MIN(date)) AS season_key FROM matches GROUP BY season
+    ) AS seasons ON m.season = seasons.season
+    SET m.season_key = seasons.season_key
+    WHERE m.season_key IS NULL
+"""
+
+# Keys new matches on insert with the same rule, so rows loaded after the
+# backfill never carry a NULL key: the season's existing key, or the year of
+# its first match when the season is new
+SEASON_KEY_TRIGGER = "matches_season_key"
+SEASON_KEY_TRIGGER_DDL = f"""
+    CREATE TRIGGER {SEASON_KEY_TRIGGER} BEFORE INSERT ON matches FOR EACH ROW
+    SET NEW.season_key = COALESCE(
+        NEW.season_key,
+        (SELECT MIN(season_key) FROM matches WHERE season = NEW.season),
+        YEAR(NEW.date)
+    )
+"""
+
+# (table, index name, columns) for the app's query shapes
+INDEXES = [
+    (
+        "matches",
+        "idx_matches_team1_team2_season",
+        ["team1_id", "team2_id", "season_key"],
+    ),
+    (
+        "matches",
+        "idx_matches_team2_team1_season",
+        ["team2_id", "team1_id", "season_key"],
+    ),
+    ("matches", "idx_matches_season", ["season_key"]),
+    ("deliveries", "idx_deliveries_match_inning", ["match_id", "inning"]),
+    ("deliveries", "idx_deliveries_batting_team", ["batting_team_id", "match_id"]),
+    ("deliveries", "idx_deliveries_bowling_team", ["bowling_team_id", "match_id"]),
+]
+
+# TEXT columns can only be indexed on a prefix
+TEXT_PREFIX_LENGTH = 64
+TEXT_TYPES = ("tinytext", "text", "mediumtext", "longtext", "blob")
+
+
+def _column_types(cursor, table):
+    cursor.execute(
+        "SELECT column_name, data_type FROM information_schema.columns "
+        "WHERE table_schema = DATABASE() AND table_name = %s",
+        (table,),
+    )
+    return {name: data_type.lower() for name, data_type in cursor.fetchall()}
+
+
+def _existing_indexes(cursor, table):
+    cursor.execute(
+        "SELECT index_name, column_name FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = %s "
+        "ORDER BY index_name, seq_in_index",
+        (table,),
+    )
+    indexes = {}
+    for index_name, column_name in cursor.fetchall():
+        indexes.setdefault(index_name, []).append(column_name)
+    return indexes
+
+
+def _existing_tables(cursor):
+    cursor.execute(
+        "SELECT table_name FROM information_schema.tables "
+        "WHERE table_schema = DATABASE()"
+    )
+    return {row[0] for row in cursor.fetchall()}
+
+
+def verify_indexes(cnx):
+    """Indexes from INDEXES whose columns are not covered by any index
+
+    Args:
+        cnx (ConnectionPool): connection pool
+
+    Returns:
+        list: (table, index name, columns) still missing
+    """
+    missing = []
+    with cnx.connection() as conn:
+        cursor = conn.cursor()
+        existing = {}
+        for table, name, columns in INDEXES:
+            if table not in existing:
+                existing[table] = _existing_indexes(cursor, table).values()
+            if not any(index[: len(columns)] == columns for index in existing[table]):
+                missing.append((table, name, columns))
+    return missing
+
+
+def _existing_triggers(cursor, table):
+    cursor.execute(
+        "SELECT trigger_name FROM information_schema.triggers "
+        "WHERE trigger_schema = DATABASE() AND event_object_table = %s",
+        (table,),
+    )
+    return {row[0] for row in cursor.fetchall()}
+
+
+def fill_season_keys(matches_df):
+    """Fill NULL season keys in a matches frame with the backfill's rule,
+    for rows inserted before the season_key trigger existed
+
+    Args:
+        matches_df (pd.DataFrame): matches with season, date and season_key
+
+    Returns:
+        pd.DataFrame: matches without NULL season keys
+    """
+    missing = matches_df["season_key"].isna()
+    if not missing.any():
+        return matches_df
+    years = pd.to_datetime(matches_df["date"]).dt.year
+    first_years = years.groupby(matches_df["season"]).transform("min")
+    print(f"Deriving season_key for {int(missing.sum())} matches")
+    return matches_df.assign(season_key=matches_df["season_key"].fillna(first_years))
+
+
+def apply_columns(cnx):
+    """Add the missing columns, backfill season_key for existing matches
+    and key later inserts with a trigger.
+
+    Args:
+        cnx (ConnectionPool): connection pool
+
+    Returns:
+        int: matches rows whose season_key was filled in
+    """
+    with cnx.connection() as conn:
+        cursor = conn.cursor()
+        for table, column, definition in COLUMNS:
+            if column not in _column_types(cursor, table):
+                print(f"Adding column {column} to {table}")
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        backfilled = cursor.execute(SEASON_KEY_BACKFILL)
+        if SEASON_KEY_TRIGGER not in _existing_triggers(cursor, "matches"):
+            print(f"Creating trigger {SEASON_KEY_TRIGGER} on matches")
+            cursor.execute(SEASON_KEY_TRIGGER_DDL)
+        conn.commit()
+
+    if backfilled:
+        # Updated rows do not move the row-count fingerprint
+        invalidate_snapshot()
+    return backfilled
+
+
+def apply_migrations(cnx):
+    """Add the missing columns and create the missing indexes
+
+    Args:
+        cnx (ConnectionPool): connection pool
+
+    Returns:
+        list: names of the indexes created
+    """
+    apply_columns(cnx)
+
+    created = []
+    missing = verify_indexes(cnx)
+    with cnx.connection() as conn:
+        cursor = conn.cursor()
+        for table, name, columns in missing:
+            types = _column_types(cursor, table)
+            parts = [
+                f"`{col}`({TEXT_PREFIX_LENGTH})"
+                if types.get(col) in TEXT_TYPES
+                else f"`{col}`"
+                for col in columns
+            ]
+            print(f"Creating index {name} on {table} ({', '.join(columns)})")
+            cursor.execute(f"CREATE INDEX {name} ON {table} ({', '.join(parts)})")
+            created.append(name)
+    return created
+
+
+def get_app_queries(cnx):
+    """Every query issued by the utils package, with sample parameters
+
+    Args:
+        cnx (ConnectionPool): connection pool
+
+    Returns:
+        dict: query name -> (query, params)
+    """
+    from utils.matches.teams import teams_query
+    from utils.matches.seasons import seasons_query
+    from utils.team.team_data import team_matches_query, team_innings_query
+    from utils.matches.head_to_head import head_to_head_query
+    from utils.team.team_players_data import (
+        team_players_query,
+        team_match_ids_query,
+        team_deliveries_query,
+        team_stream_query,
+    )
+    from utils.team.player_stats import batter_queries, bowler_queries, summary_queries
+
+    with cnx.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT id, team1_id, team2_id, season_key FROM matches "
+            "ORDER BY id DESC LIMIT 1"
+        )
+        match_id, team1_id, team2_id, season_key = cursor.fetchone()
+        tables = _existing_tables(cursor)
+
+    # Sample queries filter from the latest season onwards
+    builders = {
+        "get_teams": teams_query(),
+        "get_seasons": seasons_query(),
+        "get_team_data": team_matches_query(team1_id, season_key),
+        "get_head_to_head_data": head_to_head_query(team1_id, team2_id, season_key),
+        "get_team_players_data": team_players_query(team1_id, team2_id, season_key),
+        "iter_team_deliveries.matches": team_match_ids_query(team1_id, season_key),
+        "iter_team_deliveries": team_deliveries_query([match_id]),
+        "iter_team_deliveries.stream": team_stream_query(team1_id, None, season_key),
+    }
+    for side in ("batting", "bowling"):
+        builders[f"iter_team_deliveries.{side}"] = team_deliveries_query(
+            [match_id], team1_id, side
+        )
+        builders[f"iter_team_deliveries.stream.{side}"] = team_stream_query(
+            team1_id, side, season_key
+        )
+    if "innings" in tables:
+        builders["get_team_innings"] = team_innings_query(team1_id, season_key)
+    queries = {name: builder.render() for name, builder in builders.items()}
+
+    params = {"team_id": team1_id, "season_from": season_key, "season_to": None}
+    for group, rendered in (("batter", batter_queries), ("bowler", bowler_queries)):
+        for name, query in rendered(season_key).items():
+            queries[f"{group}_stats.{name}"] = (query, params)
+    for name, query in summary_queries(season_key).items():
+        if name in tables:
+            queries[f"innings_summary.{name}"] = (query, params)
+    return queries
+
+
+def check_query_plans(cnx):
+    """EXPLAIN every utils query and report base tables read by full scan
+
+    Args:
+        cnx (ConnectionPool): connection pool
+
+    Returns:
+        dict: query name -> tables scanned in full; empty when every plan is indexed
+    """
+    full_scans = {}
+    queries = get_app_queries(cnx)
+    with cnx.connection() as conn:
+        cursor = conn.cursor()
+        for name, (query, params) in queries.items():
+            cursor.execute("EXPLAIN " + query, params)
+            columns = [column[0] for column in cursor.description]
+            plan = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            # Derived tables (<derived2>, ...) are scans of our own subqueries
+            scanned = [
+                step["table"]
+                for step in plan
+                if step["type"] == "ALL" and not str(step["table"]).startswith("<")
+            ]
+            if scanned:
+                full_scans[name] = scanned
+    return full_scans
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    from models import get_pool
+
+    pool = get_pool()
+    apply_migrations(pool)
+
+    missing = verify_indexes(pool)
+    for table, name, columns in missing:
+        print(f"Missing index {name} on {table} ({', '.join(columns)})")
+
+    if "--check" in sys.argv:
+        full_scans = check_query_plans(pool)
+        for name, tables in full_scans.items():
+            print(f"Full table scan in {name}: {', '.join(tables)}")
+        if full_scans:
+            sys.exit(1)
+        print("Every utils query uses an index")
+
+    sys.exit(1 if missing else 0)
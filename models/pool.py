@@ -0,0 +1,236 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+
+import pymysql
+
+from .conn import connect_to_db
+
+
+class ConnectionPool:
+    """Bounded pool of PyMySQL connections shared by every Streamlit session.
+
+    Each thread leases at most one connection at a time; nested ``connection()``
+    calls on the same thread reuse the lease. Idle connections are health
+    checked with ``ping`` before reuse and closed once they sit idle for longer
+    than ``idle_timeout`` seconds.
+    """
+
+    def __init__(self, max_size=5, idle_timeout=300, ping_interval=30, timeout=10):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.ping_interval = ping_interval
+        self.timeout = timeout
+
+        self._cond = threading.Condition()
+        self._idle = []  # (connection, last_used) pairs, most recent last
+        self._size = 0
+        self._local = threading.local()
+        self._metrics = {
+            "created": 0,
+            "reused": 0,
+            "reconnects": 0,
+            "reaped": 0,
+            "discarded": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "timeouts": 0,
+        }
+
+    @contextmanager
+    def connection(self):
+        """Lease a connection for the current thread.
+
+        Yields:
+            pymysql.connections.Connection: healthy connection
+        """
+        lease = getattr(self._local, "lease", None)
+        if lease is not None:
+            self._local.depth += 1
+            try:
+                yield lease
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn = self._acquire()
+        self._local.lease = conn
+        self._local.depth = 1
+        broken = False
+        try:
+            yield conn
+        except (pymysql.OperationalError, pymysql.InterfaceError):
+            broken = True
+            raise
+        finally:
+            self._local.lease = None
+            self._local.depth = 0
+            self._release(conn, broken)
+
+    @contextmanager
+    def dedicated(self):
+        """Lease a connection outside the current thread's lease, for a
+        server-side cursor that stays open while the thread runs other
+        queries through ``connection()``.
+
+        Yields:
+            pymysql.connections.Connection: healthy connection
+        """
+        conn = self._acquire()
+        broken = False
+        try:
+            yield conn
+        except (pymysql.OperationalError, pymysql.InterfaceError):
+            broken = True
+            raise
+        finally:
+            self._release(conn, broken)
+
+    def stats(self):
+        """Snapshot of the pool counters.
+
+        Returns:
+            dict: pool metrics
+        """
+        with self._cond:
+            stats = dict(self._metrics)
+            stats["size"] = self._size
+            stats["idle"] = len(self._idle)
+            stats["in_use"] = self._size - len(self._idle)
+            stats["max_size"] = self.max_size
+        return stats
+
+    def reap_idle(self):
+        """Close connections that have been idle for longer than idle_timeout."""
+        now = time.monotonic()
+        with self._cond:
+            expired = [c for c, used in self._idle if now - used > self.idle_timeout]
+            self._idle = [
+                (c, used) for c, used in self._idle if now - used <= self.idle_timeout
+            ]
+            self._size -= len(expired)
+            self._metrics["reaped"] += len(expired)
+            if expired:
+                self._cond.notify(len(expired))
+        for conn in expired:
+            self._close(conn)
+
+    def close(self):
+        """Close every idle connection; leased ones are closed on release."""
+        with self._cond:
+            idle = [c for c, _ in self._idle]
+            self._idle = []
+            self._size -= len(idle)
+        for conn in idle:
+            self._close(conn)
+
+    def _acquire(self):
+        self.reap_idle()
+        deadline = time.monotonic() + self.timeout
+        waited = None
+
+        with self._cond:
+            while not self._idle and self._size >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if waited is None:
+                    waited = time.monotonic()
+                    self._metrics["waits"] += 1
+                if remaining <= 0:
+                    self._metrics["timeouts"] += 1
+                    raise pymysql.OperationalError(
+                        f"Timed out after {self.timeout}s waiting for a database connection"
+                    )
+                self._cond.wait(remaining)
+
+            if waited is not None:
+                self._metrics["wait_seconds"] += time.monotonic() - waited
+
+            if self._idle:
+                conn, last_used = self._idle.pop()
+                self._metrics["reused"] += 1
+            else:
+                conn, last_used = None, None
+                self._size += 1
+
+        if conn is None:
+            return self._create()
+        if time.monotonic() - last_used > self.ping_interval:
+            return self._health_check(conn)
+        return conn
+
+    def _create(self):
+        conn = connect_to_db()
+        if conn is None:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise pymysql.OperationalError("Could not connect to the database")
+        with self._cond:
+            self._metrics["created"] += 1
+        return conn
+
+    def _health_check(self, conn):
+        try:
+            was_open = conn.open
+            conn.ping(reconnect=True)
+            if not was_open:
+                with self._cond:
+                    self._metrics["reconnects"] += 1
+            return conn
+        except pymysql.Error:
+            self._close(conn)
+            with self._cond:
+                self._metrics["reconnects"] += 1
+            return self._create()
+
+    def _release(self, conn, broken):
+        if not broken:
+            try:
+                # End the read transaction so the next lease sees fresh data
+                conn.rollback()
+            except pymysql.Error:
+                broken = True
+
+        with self._cond:
+            if broken:
+                self._size -= 1
+                self._metrics["discarded"] += 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+        if broken:
+            self._close(conn)
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.close()
+        except pymysql.Error:
+            pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Process-wide connection pool, created on first use.
+
+    Sizing comes from the POOL_SIZE, POOL_IDLE_TIMEOUT, POOL_PING_INTERVAL and
+    POOL_TIMEOUT environment variables.
+
+    Returns:
+        ConnectionPool: shared pool
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(
+                max_size=int(os.getenv("POOL_SIZE", 5)),
+                idle_timeout=float(os.getenv("POOL_IDLE_TIMEOUT", 300)),
+                ping_interval=float(os.getenv("POOL_PING_INTERVAL", 30)),
+                timeout=float(os.getenv("POOL_TIMEOUT", 10)),
+            )
+        return _pool
@@ -0,0 +1,168 @@
+import os
+import json
+import time
+
+import pandas as pd
+
+from constants import MATCHES_COL, PLAYERS_COL, MATCHES_ID_COL, PLAYERS_ID_COL
+from .fetch import read_frame
+
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", ".snapshots")
+MANIFEST_FILE = "manifest.json"
+
+FRANCHISES_QUERY = """
+    SELECT a.alias, f.id, f.name
+    FROM franchise_aliases a INNER JOIN franchises f ON a.franchise_id = f.id
+    ORDER BY f.id
+"""
+
+
+def get_fingerprint(cnx):
+    """Cheap version stamp of the source tables: row counts and max ids.
+
+    Args:
+        cnx (ConnectionPool): connection pool
+
+    Returns:
+        dict: table name -> [row count, max id]
+    """
+    with cnx.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*), MAX(id) FROM matches")
+        matches = cursor.fetchone()
+        cursor.execute("SELECT COUNT(*), MAX(match_id) FROM deliveries")
+        deliveries = cursor.fetchone()
+    return {
+        "matches": [int(value or 0) for value in matches],
+        "deliveries": [int(value or 0) for value in deliveries],
+    }
+
+
+def snapshot_queries():
+    """Queries of every snapshotted table
+
+    Returns:
+        dict: table name -> (query, columns)
+    """
+    # Imported here: utils reads the store, which imports this module
+    from utils.query import Query
+
+    tables = {
+        "matches": MATCHES_COL + MATCHES_ID_COL,
+        "deliveries": PLAYERS_COL + PLAYERS_ID_COL,
+    }
+    queries = {
+        table: (Query(table, columns).render()[0], columns)
+        for table, columns in tables.items()
+    }
+    queries["franchises"] = (FRANCHISES_QUERY, ["alias", "id", "name"])
+    return queries
+
+
+def fetch_tables(cnx, fingerprint=None):
+    """Pull every snapshotted table from MySQL into typed columns
+
+    Args:
+        cnx (ConnectionPool): connection pool
+        fingerprint (dict): current source fingerprint; its row counts size
+            the column buffers up front
+
+    Returns:
+        dict: table name -> DataFrame
+    """
+    tables = {}
+    with cnx.connection() as conn:
+        for name, (query, columns) in snapshot_queries().items():
+            size_hint = (fingerprint or {}).get(name, [None])[0]
+            tables[name] = read_frame(
+                conn, query, columns=columns, categorical=False, size_hint=size_hint
+            )
+    return tables
+
+
+def read_snapshot(fingerprint, directory=SNAPSHOT_DIR):
+    """Read the local snapshot if it was taken at the given fingerprint
+
+    Args:
+        fingerprint (dict): current source fingerprint
+        directory (str): snapshot directory
+
+    Returns:
+        dict: table name -> DataFrame, or None when stale or missing
+    """
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    try:
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+        if manifest["fingerprint"] != fingerprint:
+            return None
+        # Reading the expected columns rejects snapshots taken before a
+        # column was added
+        return {
+            name: pd.read_parquet(
+                os.path.join(directory, f"{name}.parquet"), columns=columns
+            )
+            for name, (_, columns) in snapshot_queries().items()
+        }
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def write_snapshot(fingerprint, tables, directory=SNAPSHOT_DIR):
+    """Write every table and then the manifest, so readers never see a
+    manifest that points at half-written files.
+
+    Args:
+        fingerprint (dict): source fingerprint the tables were read at
+        tables (dict): table name -> DataFrame
+        directory (str): snapshot directory
+    """
+    os.makedirs(directory, exist_ok=True)
+    for name, df in tables.items():
+        tmp_path = os.path.join(directory, f"{name}.parquet.tmp")
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, os.path.join(directory, f"{name}.parquet"))
+
+    tmp_path = os.path.join(directory, f"{MANIFEST_FILE}.tmp")
+    with open(tmp_path, "w") as manifest_file:
+        json.dump({"fingerprint": fingerprint, "written_at": time.time()}, manifest_file)
+    os.replace(tmp_path, os.path.join(directory, MANIFEST_FILE))
+
+
+def invalidate_snapshot(directory=SNAPSHOT_DIR):
+    """Drop the manifest so the next load rebuilds the snapshot
+
+    Args:
+        directory (str): snapshot directory
+    """
+    try:
+        os.remove(os.path.join(directory, MANIFEST_FILE))
+    except FileNotFoundError:
+        pass
+
+
+def load_tables(cnx):
+    """Load both tables from the local snapshot, rebuilding it from MySQL only
+    when the source fingerprint has changed.
+
+    Args:
+        cnx (ConnectionPool): connection pool
+
+    Returns:
+        tuple: table name -> DataFrame dict and the fingerprint
+    """
+    start_time = time.time()
+    fingerprint = get_fingerprint(cnx)
+
+    snapshot = read_snapshot(fingerprint)
+    if snapshot is not None:
+        print(f"Snapshot loaded in {time.time() - start_time:.2f} seconds")
+        return snapshot, fingerprint
+
+    tables = fetch_tables(cnx, fingerprint)
+    try:
+        write_snapshot(fingerprint, tables)
+    except Exception as e:
+        print(f"Could not write snapshot: {e}")
+    print(f"Snapshot rebuilt from MySQL in {time.time() - start_time:.2f} seconds")
+    return tables, fingerprint
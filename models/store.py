@@ -0,0 +1,330 @@
+import os
+import time
+import threading
+
+import numpy as np
+
+from constants import (
+    MATCHES_COL,
+    PLAYERS_COL,
+    MATCHES_ID_COL,
+    PLAYERS_ID_COL,
+    INNINGS_COL,
+    POWERPLAY_OVERS,
+)
+from constants.schema import INNINGS_DTYPES, apply_schema
+from .migrations import fill_season_keys
+from .snapshot import get_fingerprint, load_tables
+
+
+class DataStore:
+    """Process-wide columnar copy of the matches and deliveries tables.
+
+    Every column is held as a NumPy array keyed by its name in MATCHES_COL or
+    PLAYERS_COL (plus the franchise id columns), so searches are boolean masks
+    and takes over arrays instead of database round trips. ``sides`` maps
+    "batting"/"bowling" to franchise id -> positions of that team's deliveries
+    in its regular (non super over) innings. ``innings`` holds the INNINGS_COL
+    totals of every innings, ordered by match id and inning.
+    """
+
+    def __init__(self):
+        self.matches = {}
+        self.deliveries = {}
+        self.franchises = {"ids": {}, "names": {}}
+        self.sides = {"batting": {}, "bowling": {}}
+        self.innings = {col: np.empty(0) for col in INNINGS_COL}
+        self.loaded = False
+        self.loaded_at = None
+        self.fingerprint = None
+        self._lock = threading.RLock()
+        self._hooks = []
+
+    def load(self, cnx):
+        """Load both tables once; later calls are no-ops.
+
+        Args:
+            cnx (ConnectionPool): connection pool
+        """
+        with self._lock:
+            if not self.loaded:
+                self._load(cnx)
+
+    def refresh(self, cnx):
+        """Reload both tables and notify the registered refresh hooks.
+
+        Args:
+            cnx (ConnectionPool): connection pool
+        """
+        with self._lock:
+            self._load(cnx)
+            hooks = list(self._hooks)
+        for hook in hooks:
+            hook(self)
+
+    def refresh_if_changed(self, cnx):
+        """Refresh only when the source tables' fingerprint has moved.
+
+        Args:
+            cnx (ConnectionPool): connection pool
+
+        Returns:
+            bool: whether a refresh happened
+        """
+        if self.loaded and get_fingerprint(cnx) == self.fingerprint:
+            return False
+        self.refresh(cnx)
+        return True
+
+    def on_refresh(self, hook):
+        """Register a callable run with the store after every refresh.
+
+        Args:
+            hook (callable): receives the store
+        """
+        with self._lock:
+            self._hooks.append(hook)
+
+    def team_mask(self, team):
+        """Boolean mask of the matches played by a team
+
+        Args:
+            team (str): team name
+
+        Returns:
+            np.ndarray: mask over matches
+        """
+        franchise_id = self.franchises["ids"].get(team, -1)
+        return (self.matches["team1_id"] == franchise_id) | (
+            self.matches["team2_id"] == franchise_id
+        )
+
+    def pair_mask(self, team1, team2):
+        """Boolean mask of the matches played between two teams
+
+        Args:
+            team1 (str): team 1 name
+            team2 (str): team 2 name
+
+        Returns:
+            np.ndarray: mask over matches
+        """
+        team1_id = self.franchises["ids"].get(team1, -1)
+        team2_id = self.franchises["ids"].get(team2, -1)
+        team1_col, team2_col = self.matches["team1_id"], self.matches["team2_id"]
+        return ((team1_col == team1_id) & (team2_col == team2_id)) | (
+            (team1_col == team2_id) & (team2_col == team1_id)
+        )
+
+    def season_mask(self, season_from=None, season_to=None):
+        """Boolean mask of the matches inside a season key range
+
+        Args:
+            season_from (int): earliest season key, or None for no lower bound
+            season_to (int): latest season key, or None for no upper bound
+
+        Returns:
+            np.ndarray: mask over matches
+        """
+        season_key = self.matches["season_key"]
+        mask = np.ones(len(season_key), dtype=bool)
+        if season_from is not None:
+            mask &= season_key >= season_from
+        if season_to is not None:
+            mask &= season_key <= season_to
+        return mask
+
+    def match_rows(self, mask):
+        """Matches rows selected by a boolean mask, as column arrays
+
+        Args:
+            mask (np.ndarray): boolean mask over matches
+
+        Returns:
+            dict: column name -> array
+        """
+        return {col: self.matches[col][mask] for col in MATCHES_COL}
+
+    def match_deliveries(self, match_ids):
+        """Deliveries of the given matches
+
+        Args:
+            match_ids (np.ndarray): ids of the matches
+
+        Returns:
+            dict: column name -> array over PLAYERS_COL
+        """
+        delivery_mask = np.isin(self.deliveries["match_id"], match_ids)
+        return {col: self.deliveries[col][delivery_mask] for col in PLAYERS_COL}
+
+    def team_positions(self, team, side=None, season_from=None, season_to=None):
+        """Positions of the deliveries of a team's matches, grouped by match
+
+        Args:
+            team (str): team name
+            side (str): "batting" or "bowling" to keep only that side's regular
+                innings (taken through the side index), or None for every innings
+            season_from (int): earliest season key, or None for no lower bound
+            season_to (int): latest season key, or None for no upper bound
+
+        Returns:
+            np.ndarray: positions into the deliveries arrays, ordered by match id
+        """
+        match_ids = self.matches["id"][self.season_mask(season_from, season_to)]
+        if side is None:
+            match_ids = np.intersect1d(
+                match_ids, self.matches["id"][self.team_mask(team)]
+            )
+            positions = np.flatnonzero(np.isin(self.deliveries["match_id"], match_ids))
+        else:
+            franchise_id = self.franchises["ids"].get(team, -1)
+            positions = self.sides[side].get(franchise_id, np.empty(0, dtype=np.intp))
+            if season_from is not None or season_to is not None:
+                positions = positions[
+                    np.isin(self.deliveries["match_id"][positions], match_ids)
+                ]
+        order = np.argsort(self.deliveries["match_id"][positions], kind="stable")
+        return positions[order]
+
+    def team_innings(self, team, season_from=None, season_to=None):
+        """Totals of a team's regular (non super over) batting innings
+
+        Args:
+            team (str): team name
+            season_from (int): earliest season key, or None for no lower bound
+            season_to (int): latest season key, or None for no upper bound
+
+        Returns:
+            dict: column name -> array over INNINGS_COL
+        """
+        franchise_id = self.franchises["ids"].get(team, -1)
+        mask = (self.innings["batting_team_id"] == franchise_id) & (
+            self.innings["inning"] <= 2
+        )
+        if season_from is not None or season_to is not None:
+            match_ids = self.matches["id"][self.season_mask(season_from, season_to)]
+            mask &= np.isin(self.innings["match_id"], match_ids)
+        return {col: self.innings[col][mask] for col in INNINGS_COL}
+
+    def _index_innings(self):
+        deliveries = self.deliveries
+        # One grouped pass: every delivery is binned by its (match, inning)
+        keys, first, group = np.unique(
+            deliveries["match_id"].astype(np.int64) * 16 + deliveries["inning"],
+            return_index=True,
+            return_inverse=True,
+        )
+        extras_type = deliveries["extras_type"]
+        total_runs = deliveries["total_runs"]
+        values = {
+            "runs": total_runs,
+            "wickets": (deliveries["is_wicket"] == 1)
+            & (deliveries["dismissal_kind"] != "retired hurt"),
+            "legal_balls": (extras_type != "wides") & (extras_type != "noballs"),
+            "extras": deliveries["extra_runs"],
+            "powerplay_runs": np.where(
+                deliveries["over"] < POWERPLAY_OVERS, total_runs, 0
+            ),
+        }
+        innings = {
+            "match_id": keys // 16,
+            "inning": keys % 16,
+            "batting_team_id": deliveries["batting_team_id"][first],
+        }
+        for col, value in values.items():
+            innings[col] = np.bincount(group, weights=value, minlength=len(keys))
+        return {col: innings[col].astype(INNINGS_DTYPES[col]) for col in INNINGS_COL}
+
+    def _index_sides(self):
+        regular = np.flatnonzero(self.deliveries["inning"] <= 2)
+        sides = {}
+        for side in ("batting", "bowling"):
+            team_ids = self.deliveries[f"{side}_team_id"][regular]
+            # Stable sort keeps each team's positions in table order
+            order = np.argsort(team_ids, kind="stable")
+            keys, starts = np.unique(team_ids[order], return_index=True)
+            sides[side] = dict(zip(keys.tolist(), np.split(regular[order], starts[1:])))
+        return sides
+
+    def _load(self, cnx):
+        start_time = time.time()
+        tables, fingerprint = load_tables(cnx)
+        # Names stay object arrays here; frames built from them categorize
+        matches = apply_schema(fill_season_keys(tables["matches"]), categorical=False)
+        deliveries = apply_schema(tables["deliveries"], categorical=False)
+
+        self.matches = {
+            col: matches[col].to_numpy() for col in MATCHES_COL + MATCHES_ID_COL
+        }
+        self.deliveries = {
+            col: deliveries[col].to_numpy() for col in PLAYERS_COL + PLAYERS_ID_COL
+        }
+        self.franchises = franchise_lookup(
+            tables["franchises"].itertuples(index=False, name=None)
+        )
+        self.sides = self._index_sides()
+        self.innings = self._index_innings()
+        self.fingerprint = fingerprint
+        self.loaded = True
+        self.loaded_at = time.time()
+        print(
+            f"Data store loaded {len(matches)} matches and {len(deliveries)} deliveries "
+            f"in {time.time() - start_time:.2f} seconds"
+        )
+
+
+def franchise_lookup(rows):
+    """Build the franchise lookup from (alias, id, name) rows
+
+    Args:
+        rows (iterable): alias, franchise id and current name per alias
+
+    Returns:
+        dict: "ids" maps every known team name to its franchise id, "names"
+        maps each franchise id to its current name
+    """
+    ids, names = {}, {}
+    for alias, franchise_id, name in rows:
+        ids[alias] = int(franchise_id)
+        names[int(franchise_id)] = name
+    return {"ids": ids, "names": names}
+
+
+_store = DataStore()
+
+
+def get_store():
+    """Process-wide data store
+
+    Returns:
+        DataStore: shared store, possibly not loaded yet
+    """
+    return _store
+
+
+def load_store(cnx):
+    """Load the shared store unless DATA_SOURCE is set to "mysql".
+
+    Args:
+        cnx (ConnectionPool): connection pool
+
+    Raises:
+        RuntimeError: when the franchise ids have not been ingested, which
+            neither the store nor the MySQL fallback can work without, or
+            when the MySQL fallback is used without the innings table
+
+    Returns:
+        DataStore: shared store
+    """
+    from .franchises import require_franchises
+    from .summary import require_innings
+
+    require_franchises(cnx)
+    if os.getenv("DATA_SOURCE", "memory") != "mysql":
+        try:
+            _store.load(cnx)
+        except Exception as e:
+            print(f"Data store unavailable, falling back to MySQL: {e}")
+    if not _store.loaded:
+        require_innings(cnx)
+    return _store
@@ -0,0 +1,191 @@
+import sys
+import time
+
+from constants import POWERPLAY_OVERS
+
+CREATE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS batter_innings (
+        match_id INT NOT NULL,
+        inning TINYINT NOT NULL,
+        batting_team_id SMALLINT NOT NULL,
+        batter VARCHAR(64) NOT NULL,
+        runs SMALLINT NOT NULL,
+        balls SMALLINT NOT NULL,
+        fours TINYINT NOT NULL,
+        sixes TINYINT NOT NULL,
+        dismissal VARCHAR(32) NULL,
+        PRIMARY KEY (match_id, inning, batter),
+        KEY idx_batter_innings_team (batting_team_id, match_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS bowler_innings (
+        match_id INT NOT NULL,
+        inning TINYINT NOT NULL,
+        bowling_team_id SMALLINT NOT NULL,
+        bowler VARCHAR(64) NOT NULL,
+        legal_balls SMALLINT NOT NULL,
+        runs_conceded SMALLINT NOT NULL,
+        wickets TINYINT NOT NULL,
+        PRIMARY KEY (match_id, inning, bowler),
+        KEY idx_bowler_innings_team (bowling_team_id, match_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS innings (
+        match_id INT NOT NULL,
+        inning TINYINT NOT NULL,
+        batting_team_id SMALLINT NOT NULL,
+        runs SMALLINT NOT NULL,
+        wickets TINYINT NOT NULL,
+        legal_balls SMALLINT NOT NULL,
+        extras SMALLINT NOT NULL,
+        powerplay_runs SMALLINT NOT NULL,
+        PRIMARY KEY (match_id, inning),
+        KEY idx_innings_team (batting_team_id, match_id)
+    )
+    """,
+]
+
+# Each insert only summarizes matches newer than the table's watermark
+INSERT_BATTER_INNINGS = """
+    INSERT INTO batter_innings
+        (match_id, inning, batting_team_id, batter, runs, balls, fours, sixes, dismissal)
+    SELECT d.match_id, d.inning, d.batting_team_id, d.batter,
+        SUM(d.batsman_runs),
+        SUM(d.extras_type IS NULL OR d.extras_type <> 'wides'),
+        SUM(d.batsman_runs = 4),
+        SUM(d.batsman_runs = 6),
+        dismissals.dismissal_kind
+    FROM deliveries d
+    INNER JOIN matches m ON d.match_id = m.id
+    LEFT JOIN (
+        SELECT match_id, inning, player_dismissed, MAX(dismissal_kind) AS dismissal_kind
+        FROM deliveries
+        WHERE is_wicket = 1 AND match_id > %(watermark)s
+        GROUP BY match_id, inning, player_dismissed
+    ) AS dismissals
+        ON dismissals.match_id = d.match_id
+        AND dismissals.inning = d.inning
+        AND dismissals.player_dismissed = d.batter
+    WHERE d.match_id > %(watermark)s
+    GROUP BY d.match_id, d.inning, d.batting_team_id, d.batter, dismissals.dismissal_kind
+"""
+
+INSERT_BOWLER_INNINGS = """
+    INSERT INTO bowler_innings
+        (match_id, inning, bowling_team_id, bowler, legal_balls, runs_conceded, wickets)
+    SELECT d.match_id, d.inning, d.bowling_team_id, d.bowler,
+        SUM(d.extras_type IS NULL OR d.extras_type NOT IN ('wides', 'noballs')),
+        SUM(d.total_runs),
+        SUM(d.is_wicket = 1 AND d.dismissal_kind <> 'run out')
+    FROM deliveries d
+    INNER JOIN matches m ON d.match_id = m.id
+    WHERE d.match_id > %(watermark)s
+    GROUP BY d.match_id, d.inning, d.bowling_team_id, d.bowler
+"""
+
+# Innings totals straight from the ball-by-ball rows, so rain-shortened
+# games need no reconstruction from the target and result margin
+INSERT_INNINGS = f"""
+    INSERT INTO innings
+        (match_id, inning, batting_team_id, runs, wickets, legal_balls, extras,
+        powerplay_runs)
+    SELECT d.match_id, d.inning, d.batting_team_id,
+        SUM(d.total_runs),
+        SUM(d.is_wicket = 1 AND d.dismissal_kind <> 'retired hurt'),
+        SUM(d.extras_type IS NULL OR d.extras_type NOT IN ('wides', 'noballs')),
+        SUM(d.extra_runs),
+        SUM(CASE WHEN d.`over` < {POWERPLAY_OVERS} THEN d.total_runs ELSE 0 END)
+    FROM deliveries d
+    INNER JOIN matches m ON d.match_id = m.id
+    WHERE d.match_id > %(watermark)s
+    GROUP BY d.match_id, d.inning, d.batting_team_id
+"""
+
+SUMMARY_TABLES = {
+    "batter_innings": INSERT_BATTER_INNINGS,
+    "bowler_innings": INSERT_BOWLER_INNINGS,
+    "innings": INSERT_INNINGS,
+}
+
+
+def build_summary_tables(cnx, rebuild=False):
+    """Create and bring the batter/bowler innings and innings totals summary
+    tables up to date; run after loading new matches.
+
+    Only matches newer than the highest match_id already summarized are
+    aggregated, unless rebuild is set. Needs the franchise ids written by
+    models.franchises.
+
+    Args:
+        cnx (ConnectionPool): connection pool
+        rebuild (bool): recreate the tables and summarize every match again
+
+    Returns:
+        dict: table name -> rows inserted
+    """
+    inserted = {}
+    with cnx.connection() as conn:
+        cursor = conn.cursor()
+        if rebuild:
+            for table in SUMMARY_TABLES:
+                cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        for statement in CREATE_TABLES:
+            cursor.execute(statement)
+
+        for table, insert in SUMMARY_TABLES.items():
+            start_time = time.time()
+            cursor.execute(f"SELECT COALESCE(MAX(match_id), 0) FROM {table}")
+            watermark = cursor.fetchone()[0]
+
+            inserted[table] = cursor.execute(insert, {"watermark": watermark})
+            conn.commit()
+            print(
+                f"{table}: {inserted[table]} rows after match {watermark} "
+                f"in {time.time() - start_time:.2f} seconds"
+            )
+    return inserted
+
+
+def require_innings(cnx):
+    """Fail fast when the innings table is missing. Without the data store,
+    score analysis reads the team innings totals from it. Checked once per
+    process.
+
+    Args:
+        cnx (ConnectionPool): connection pool
+
+    Raises:
+        RuntimeError: naming the missing table and how to create it
+    """
+    global _verified
+    if _verified:
+        return
+    with cnx.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT COUNT(*) FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = 'innings'"
+        )
+        exists = cursor.fetchone()[0]
+    if not exists:
+        raise RuntimeError(
+            "The innings table is missing; "
+            "run `python -m models.summary` against this database"
+        )
+    _verified = True
+
+
+_verified = False
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    from models import get_pool
+
+    build_summary_tables(get_pool(), rebuild="--rebuild" in sys.argv)
@@ -1,2 +1,3 @@
 from .team.index import team_analysis
 from .head_to_head.main import head_to_head_screen
+from .query_metrics import show_query_metrics
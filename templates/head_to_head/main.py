@@ -1,23 +1,30 @@
 import streamlit as st
 
 from views import head_to_head_insights
-from utils import get_teams, get_seasons
+from utils import get_teams, get_seasons, run_concurrently
 from .tabs.tabs import overall_performance, home_away_analysis
 
 
 def head_to_head_screen(cnx):
     st.title("Head to Head Comparison")
 
-    # Fetching all the teams data
-    teams_data = get_teams(cnx)
-    seasons_data = get_seasons(cnx)
+    # Fetching all the teams and seasons data together
+    results = run_concurrently(
+        {"teams": (get_teams, (cnx,)), "seasons": (get_seasons, (cnx,))}
+    )
+    teams_data, seasons_data = (
+        results["data"].get(
+            name, {"status": False, "message": results["message"], "data": []}
+        )
+        for name in ("teams", "seasons")
+    )
 
     if not seasons_data["status"]:
         st.error(seasons_data["message"])
 
-    seasons_data = seasons_data["data"]
-    seasons_data.reverse()
-    seasons_data.insert(0, "All Seasons")
+    # Season key -> label; None stands for every season
+    seasons = dict(seasons_data["data"])
+    season_keys = [None] + sorted(seasons, reverse=True)
 
     # Options to select the teams
     col1, col2, col3 = st.columns(3)
@@ -26,7 +33,11 @@ def head_to_head_screen(cnx):
     with col2:
         team2 = st.selectbox("Team 2", teams_data["data"])
     with col3:
-        season_selection = st.selectbox("Seasons", seasons_data)
+        season_selection = st.selectbox(
+            "Seasons",
+            season_keys,
+            format_func=lambda key: "All Seasons" if key is None else seasons[key],
+        )
 
     # Search button to trigger
     search_btn_pressed = st.button("Search")
@@ -37,6 +48,8 @@ def head_to_head_screen(cnx):
         if not response["status"]:
             st.error(response["message"])
         else:
+            for name, error in response["errors"].items():
+                st.warning(f"Some {name} data could not be loaded: {error}")
             st.markdown(" ")
             st.header(f"Head-to-Head: {team1} vs. {team2}")
             tab1, tab2, tab3 = st.tabs(
@@ -0,0 +1,28 @@
+import os
+
+import pandas as pd
+import streamlit as st
+
+from utils import query_metrics
+
+SHOW_QUERY_METRICS = os.getenv("SHOW_QUERY_METRICS", "0") == "1"
+
+
+def show_query_metrics(screen):
+    """Debug expander with what a screen's queries have pulled from MySQL
+    since the process started (SHOW_QUERY_METRICS=1)
+
+    Args:
+        screen (str): screen name the queries were recorded under
+    """
+    if not SHOW_QUERY_METRICS:
+        return
+
+    stats = query_metrics.stats(screen)
+    with st.expander("Query metrics"):
+        if not stats:
+            st.caption("No queries reached MySQL for this screen yet")
+            return
+        df = pd.DataFrame.from_dict(stats, orient="index")
+        df["kib"] = (df.pop("bytes") / 1024).round(1)
+        st.dataframe(df.sort_values("kib", ascending=False))
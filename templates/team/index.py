@@ -14,22 +14,31 @@ def team_analysis(cnx):
     seasons_data = get_seasons(cnx)
     if not seasons_data["status"]:
         st.error(seasons_data["message"])
-    seasons_data = seasons_data["data"]
-    seasons_data.reverse()
-    seasons_data.insert(0, "All Seasons")
+    # Season key -> label; None stands for every season
+    seasons = dict(seasons_data["data"])
+    season_keys = [None] + sorted(seasons, reverse=True)
 
     # Options to select the teams
     col1, col2 = st.columns(2)
     with col1:
         team = st.selectbox("Team", teams_data["data"])
     with col2:
-        season_selection = st.selectbox("Seasons", seasons_data)
+        season_selection = st.selectbox(
+            "Seasons",
+            season_keys,
+            format_func=lambda key: "All Seasons" if key is None else seasons[key],
+        )
 
     # Search button to trigger
     search_btn_pressed = st.button("Search")
     if search_btn_pressed:
-        response = get_team_analysis(cnx, team, season_selection)
+        # Kept across reruns so switching sections reuses computed sections
+        st.session_state["team_analysis"] = get_team_analysis(
+            cnx, team, season_selection
+        )
 
+    response = st.session_state.get("team_analysis")
+    if response is not None:
         st.markdown(" ")
-        st.header(f"Team Analysis: {team}")
-        show_team_analysis(response, team)
+        st.header(f"Team Analysis: {response.team}")
+        show_team_analysis(response, response.team)
@@ -8,7 +8,10 @@ from .tabs.player_analysis import show_player_analysis
 
 
 def show_team_analysis(response, team):
-    tab1, player_tab, tab2, tab3, tab4, tab5 = st.tabs(
+    # Only the selected section is rendered, so the lazy response computes
+    # just the data that section reads (st.tabs would render all of them)
+    section = st.radio(
+        "Section",
         [
             "Overall Performance",
             "Player Performance",
@@ -16,22 +19,24 @@ def show_team_analysis(response, team):
             "Score Analysis",
             "Super Over Analysis",
             "Non League Matches",
-        ]
+        ],
+        horizontal=True,
+        label_visibility="collapsed",
     )
-    with tab1:
+    if section == "Overall Performance":
         st.metric(
             "Most player of the matches won by " + team,
             value=f"{response['most_player_of_match'].index[0]} ({response['most_player_of_match'].values[0]})",
         )
         overall_performance_team(response, team)
-    with tab2:
+    elif section == "Toss Analysis":
         toss_analysis(response, team)
-    with tab3:
+    elif section == "Score Analysis":
         score_analysis(response, team)
-    with tab4:
+    elif section == "Super Over Analysis":
         super_over_analysis(response["super_over_analysis"], team)
-    with tab5:
+    elif section == "Non League Matches":
         non_league_matches(response, team)
-    with player_tab:
+    elif section == "Player Performance":
         st.subheader(f"Batting & Bowling Figures of {team}")
         show_player_analysis(response["players_analysis"], team)
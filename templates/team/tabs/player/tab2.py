@@ -362,8 +362,8 @@ def display_metrics_tab(data):
     )
 
     # 5-wicket hauls
-    five_wicket_hauls = data["wickets_inning"][
-        data["wickets_inning"]["total_wickets"] >= 5
+    five_wicket_hauls = data["wicket_hauls"][
+        data["wicket_hauls"]["total_wickets"] >= 5
     ].copy()
     if not five_wicket_hauls.empty:
         st.markdown(
@@ -404,9 +404,8 @@ def display_metrics_tab(data):
         st.info("No 5-wicket hauls recorded")
 
     # 4-wicket hauls
-    four_wicket_hauls = data["wickets_inning"][
-        (data["wickets_inning"]["total_wickets"] >= 4)
-        & (data["wickets_inning"]["total_wickets"] < 5)
+    four_wicket_hauls = data["wicket_hauls"][
+        data["wicket_hauls"]["total_wickets"] == 4
     ].copy()
     if not four_wicket_hauls.empty:
         st.markdown(
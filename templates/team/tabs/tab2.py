@@ -64,17 +64,14 @@ def toss_analysis(response, team):
         st.subheader(f"Toss Statistics of {team}")
 
         # Calculate metrics
-        total_matches = response["total_matches"].shape[0]
-        toss_won = response["toss_analysis"]["toss_won"].shape[0]
+        totals = response["season_totals"]
+        total_matches = totals["matches"]
+        toss_won = totals["tosses"]
         toss_lost = total_matches - toss_won
         toss_win_percentage = (toss_won / total_matches) * 100
-        match_won_after_toss_win = response["toss_analysis"][
-            "toss_won_match_won"
-        ].shape[0]
+        match_won_after_toss_win = totals["toss_and_match_wins"]
         match_lost_after_toss_win = toss_won - match_won_after_toss_win
-        match_won_after_toss_loss = response["toss_analysis"][
-            "toss_loss_match_won"
-        ].shape[0]
+        match_won_after_toss_loss = totals["wins"] - match_won_after_toss_win
         match_lost_after_toss_loss = toss_lost - match_won_after_toss_loss
 
         # Create tabs
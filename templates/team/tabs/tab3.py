@@ -84,11 +84,7 @@ def template(response, team, key, scenario):
     with col1:
         if key in response["highest_score"]:
             data = response["highest_score"][key]
-            score = (
-                int(data["target_runs"] - 1)
-                if "Bat" in scenario
-                else int(data["actual_runs"])
-            )
+            score = f"{data['actual_runs']}/{data['actual_wickets']}"
 
             st.markdown(
                 f"""
@@ -106,11 +102,7 @@ def template(response, team, key, scenario):
     with col2:
         if key in response["lowest_score"]:
             data = response["lowest_score"][key]
-            score = (
-                int(data["target_runs"] - 1)
-                if "Bat" in scenario
-                else int(data["actual_runs"])
-            )
+            score = f"{data['actual_runs']}/{data['actual_wickets']}"
 
             st.markdown(
                 f"""
@@ -1,5 +1,17 @@
 from .matches.teams import get_teams
 from .matches.seasons import get_seasons
-from .team.team_data import get_team_data
+from .team.team_data import get_team_data, get_team_innings
 from .matches.head_to_head import get_head_to_head_data
-from .team.team_players_data import get_team_players_data
+from .team.team_players_data import (
+    get_team_players_data,
+    iter_team_deliveries,
+    join_matches,
+)
+from .parallel import run_concurrently
+from .cache import query_cache
+from .query import query_metrics
+from .team.player_stats import (
+    get_batter_stats,
+    get_bowler_stats,
+    get_innings_summary,
+)
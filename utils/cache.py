@@ -0,0 +1,130 @@
+import os
+import copy
+import time
+import threading
+import functools
+from collections import OrderedDict
+
+from models import get_store
+from models.snapshot import get_fingerprint
+
+
+class QueryCache:
+    """LRU cache of utils getter responses shared by every Streamlit session.
+
+    Entries are keyed by getter and arguments (the connection pool is left
+    out), expire after ``ttl`` seconds, and are all dropped when the data
+    version stamp changes.
+    """
+
+    def __init__(self, max_entries=256, ttl=600, version_interval=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version_interval = version_interval
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._version = None
+        self._version_checked_at = 0.0
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    def cached(self, getter):
+        """Decorate a getter(cnx, *args) that returns a response dict
+
+        Args:
+            getter (callable): utils getter
+
+        Returns:
+            callable: caching wrapper
+        """
+
+        @functools.wraps(getter)
+        def wrapper(cnx, *args, **kwargs):
+            self._check_version(cnx)
+            key = (
+                getter.__module__,
+                getter.__qualname__,
+                args,
+                tuple(sorted(kwargs.items())),
+            )
+
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and time.monotonic() - entry[1] > self.ttl:
+                    del self._entries[key]
+                    self._stats["expirations"] += 1
+                    entry = None
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return _copy_response(entry[0])
+                self._stats["misses"] += 1
+
+            response = getter(cnx, *args, **kwargs)
+            if response["status"]:
+                with self._lock:
+                    self._entries[key] = (response, time.monotonic())
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                        self._stats["evictions"] += 1
+            return _copy_response(response)
+
+        return wrapper
+
+    def invalidate(self, *_):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+            self._stats["invalidations"] += 1
+
+    def stats(self):
+        """Snapshot of the cache counters
+
+        Returns:
+            dict: cache metrics
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+    def _check_version(self, cnx):
+        store = get_store()
+        if store.loaded:
+            version = store.fingerprint
+        elif time.monotonic() - self._version_checked_at >= self.version_interval:
+            try:
+                version = get_fingerprint(cnx)
+            except Exception:
+                return
+            self._version_checked_at = time.monotonic()
+        else:
+            return
+
+        if version != self._version:
+            if self._version is not None:
+                self.invalidate()
+            self._version = version
+
+
+def _copy_response(response):
+    # Callers reverse or extend the lists they get back
+    return {**response, "data": copy.copy(response["data"])}
+
+
+query_cache = QueryCache(
+    max_entries=int(os.getenv("CACHE_SIZE", 256)),
+    ttl=float(os.getenv("CACHE_TTL", 600)),
+)
+get_store().on_refresh(query_cache.invalidate)
+
+cached_query = query_cache.cached
@@ -1,22 +1,56 @@
-def get_head_to_head_data(cnx, team1, team2):
+from models import get_store
+from ..cache import cached_query
+from models.franchises import get_franchise_id
+from ..query import Query, fetch_frame
+from constants import MATCHES_COL
+
+PAIR_CONDITION = (
+    "((`matches`.`team1_id` = %s AND `matches`.`team2_id` = %s) "
+    "OR (`matches`.`team1_id` = %s AND `matches`.`team2_id` = %s))"
+)
+
+
+def head_to_head_query(team1_id, team2_id, season_from=None, season_to=None):
+    """Matches between two franchises, MATCHES_COL"""
+    return (
+        Query("matches", MATCHES_COL)
+        .where(PAIR_CONDITION, team1_id, team2_id, team2_id, team1_id)
+        .where_season("season_key", season_from, season_to)
+    )
+
+
+@cached_query
+def get_head_to_head_data(cnx, team1, team2, season_from=None, season_to=None):
     """Getting match data between the two teams
 
     Args:
-        cnx (_type_): connection object
+        cnx (ConnectionPool): connection pool
         team1 (_type_): team 1 name
         team2 (_type_): team 2 name
+        season_from (int): earliest season key, or None for every season
+        season_to (int): latest season key, or None for every season
 
     Returns:
         _type_: dict
     """
     
     try:
-        cursor = cnx.cursor()
-        
-        query = f"SELECT * FROM matches WHERE (team1 = '{team1}' AND team2 = '{team2}') OR (team1 = '{team2}' AND team2 = '{team1}');"
-        cursor.execute(query)
-        data = cursor.fetchall()
-        data = [row[1:] for row in data]
+        store = get_store()
+        if store.loaded:
+            mask = store.pair_mask(team1, team2) & store.season_mask(
+                season_from, season_to
+            )
+            data = store.match_rows(mask)
+            return {"status": True, "message": "Data Fetched Successfully", "data": data}
+
+        with cnx.connection() as conn:
+            team1_id = get_franchise_id(cnx, team1)
+            team2_id = get_franchise_id(cnx, team2)
+            data = fetch_frame(
+                conn,
+                "get_head_to_head_data",
+                head_to_head_query(team1_id, team2_id, season_from, season_to),
+            )
         
         return {"status": True, "message": "Data Fetched Successfully", "data": data}
     
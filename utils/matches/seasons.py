@@ -1,18 +1,49 @@
+import numpy as np
+
+from models import get_store
+from ..cache import cached_query
+from ..query import Query, fetch_all
+
+
+def seasons_query():
+    return (
+        Query("matches", ["season_key", ("MIN", "season")])
+        .group_by("season_key")
+        .order_by("season_key")
+    )
+
+
+@cached_query
 def get_seasons(cnx):
-    """Fetching distinct teams from the database.
+    """Fetching distinct seasons from the database.
 
     Args:
-        cnx (_type_): connection
+        cnx (ConnectionPool): connection pool
 
     Returns:
-        dict: distinct teams response
+        dict: (season key, season label) pairs ordered by key
     """
 
     try:
-        cursor = cnx.cursor()
-        cursor.execute("SELECT DISTINCT(season) FROM matches")
-        seasons_data = cursor.fetchall()
-        seasons_data = [season[0] for season in seasons_data]
+        store = get_store()
+        if store.loaded:
+            season_keys, first_rows = np.unique(
+                store.matches["season_key"], return_index=True
+            )
+            season_labels = store.matches["season"][first_rows]
+            seasons_data = list(zip(season_keys.tolist(), season_labels.tolist()))
+            return {"status": True, "message": "Seasons data fetched", "data": seasons_data}
+
+        with cnx.connection() as conn:
+            cursor = conn.cursor()
+            seasons_data = fetch_all(cursor, "get_seasons", seasons_query())
+        # Matches inserted before the season_key trigger have no key until
+        # python -m models.migrations backfills them
+        seasons_data = [
+            (int(season_key), season)
+            for season_key, season in seasons_data
+            if season_key is not None
+        ]
 
         return {"status": True, "message": "Seasons data fetched", "data": seasons_data}
 
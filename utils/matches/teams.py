@@ -1,17 +1,32 @@
+from models import get_store
+from ..cache import cached_query
+from ..query import Query, fetch_all
+
+
+def teams_query():
+    return Query("franchises", ["name"]).order_by("id")
+
+
+@cached_query
 def get_teams(cnx):
     """Fetching distinct teams from the database.
 
     Args:
-        cnx (_type_): connection
+        cnx (ConnectionPool): connection pool
 
     Returns:
         dict: distinct teams response
     """
 
     try:
-        cursor = cnx.cursor()
-        cursor.execute("SELECT DISTINCT(team1) FROM matches")
-        teams_data = cursor.fetchall()
+        store = get_store()
+        if store.loaded:
+            teams_data = list(store.franchises["names"].values())
+            return {"status": True, "message": "Teams data fetched", "data": teams_data}
+
+        with cnx.connection() as conn:
+            cursor = conn.cursor()
+            teams_data = fetch_all(cursor, "get_teams", teams_query())
         teams_data = [team[0] for team in teams_data]
 
         return {"status": True, "message": "Teams data fetched", "data": teams_data}
@@ -0,0 +1,65 @@
+import os
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from .query import statement_timeout
+
+# Each worker leases its own pooled connection inside the getter it runs
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("QUERY_WORKERS", 4)), thread_name_prefix="query"
+)
+
+QUERY_TIMEOUT = float(os.getenv("QUERY_TIMEOUT", 30))
+
+
+def run_concurrently(calls, timeout=QUERY_TIMEOUT):
+    """Run independent utils getters at the same time. Every SELECT they
+    send is stopped by MySQL after timeout seconds, so a timed out getter
+    returns soon after instead of holding its worker and connection.
+
+    Args:
+        calls (dict): name -> (getter, args)
+        timeout (float): seconds to wait for the slowest getter
+
+    Returns:
+        dict: "data" maps each name to the getter's response, "errors" maps
+        each failed or timed out name to its message
+    """
+    # Workers run in a copy of this context, so they see the time limit and
+    # their queries are attributed to the caller's screen
+    with statement_timeout(timeout):
+        futures = {
+            name: _executor.submit(contextvars.copy_context().run, getter, *args)
+            for name, (getter, args) in calls.items()
+        }
+    wait(futures.values(), timeout=timeout)
+
+    data, errors = {}, {}
+    for name, future in futures.items():
+        if not future.done():
+            if future.cancel():
+                errors[name] = f"not started within {timeout}s"
+                continue
+            # A running getter cannot be cancelled; its worker is only free
+            # once the server has stopped the query and the getter returned
+            errors[name] = f"timed out after {timeout}s"
+            future.add_done_callback(
+                lambda _, name=name: print(f"{name} released its worker")
+            )
+            continue
+        try:
+            response = future.result()
+        except Exception as e:
+            errors[name] = str(e)
+            continue
+        data[name] = response
+        if not response["status"]:
+            errors[name] = str(response["message"])
+
+    message = "; ".join(f"{name}: {error}" for name, error in errors.items())
+    return {
+        "status": not errors,
+        "message": message or "All queries succeeded",
+        "data": data,
+        "errors": errors,
+    }
@@ -0,0 +1,300 @@
+import re
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+
+import pandas as pd
+
+from models.fetch import FETCH_CHUNK_ROWS, iter_frames, read_frame
+from constants.schema import SCHEMA
+
+IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+SELECT = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
+
+# Seconds a SELECT may run on the server, set by statement_timeout()
+_statement_timeout = contextvars.ContextVar("statement_timeout", default=None)
+
+
+def quote(name):
+    """Backtick-quote a column or table name, optionally table-qualified
+
+    Args:
+        name (str): "column" or "table.column"
+
+    Returns:
+        str: quoted identifier, e.g. `deliveries`.`match_id`
+    """
+    parts = name.split(".")
+    for part in parts:
+        if not IDENTIFIER.match(part):
+            raise ValueError(f"Not a plain SQL identifier: {name!r}")
+    return ".".join(f"`{part}`" for part in parts)
+
+
+class Query:
+    """Projected, parameterized SELECT built from a consumer's column list.
+
+    Columns are names from constants.data (qualified with the base table
+    unless they name their own), or (function, column) pairs such as
+    ("MIN", "season"). Values only ever travel as %s parameters.
+    """
+
+    def __init__(self, table, columns):
+        self.table = table
+        self.columns = list(columns)
+        self._joins = []
+        self._conditions = []
+        self._params = []
+        self._group_by = []
+        self._order_by = []
+
+    def join(self, table, on):
+        """INNER JOIN another table on a condition between quoted columns"""
+        self._joins.append(f" INNER JOIN {quote(table)} ON {on}")
+        return self
+
+    def where(self, condition, *params):
+        """AND a condition with %s placeholders for params"""
+        self._conditions.append(condition)
+        self._params.extend(params)
+        return self
+
+    def where_equal(self, column, value):
+        """AND column = value"""
+        return self.where(f"{self._qualify(column)} = %s", value)
+
+    def where_in(self, column, values):
+        """AND column IN (values), one placeholder per value"""
+        placeholders = ", ".join(["%s"] * len(values))
+        return self.where(f"{self._qualify(column)} IN ({placeholders})", *values)
+
+    def where_season(self, column, season_from=None, season_to=None):
+        """AND a season key range; unbounded sides are left out"""
+        if season_from is not None:
+            self.where(f"{self._qualify(column)} >= %s", int(season_from))
+        if season_to is not None:
+            self.where(f"{self._qualify(column)} <= %s", int(season_to))
+        return self
+
+    def group_by(self, *columns):
+        """GROUP BY columns, qualified like the selected ones"""
+        self._group_by.extend(columns)
+        return self
+
+    def order_by(self, *columns):
+        """ORDER BY columns, qualified like the selected ones"""
+        self._order_by.extend(columns)
+        return self
+
+    def render(self):
+        """SQL text and its parameters
+
+        Returns:
+            tuple: query string and params tuple
+        """
+        columns = ", ".join(self._column(column) for column in self.columns)
+        sql = f"SELECT {columns} FROM {quote(self.table)}{''.join(self._joins)}"
+        if self._conditions:
+            sql += " WHERE " + " AND ".join(self._conditions)
+        if self._group_by:
+            sql += " GROUP BY " + ", ".join(map(self._qualify, self._group_by))
+        if self._order_by:
+            sql += " ORDER BY " + ", ".join(map(self._qualify, self._order_by))
+        return sql + ";", tuple(self._params)
+
+    def _qualify(self, column):
+        return quote(column if "." in column else f"{self.table}.{column}")
+
+    def _column(self, column):
+        if isinstance(column, tuple):
+            function, column = column
+            if not IDENTIFIER.match(function):
+                raise ValueError(f"Not a plain SQL function: {function!r}")
+            return f"{function}({self._qualify(column)})"
+        return self._qualify(column)
+
+
+class QueryMetrics:
+    """Per-query call, row, byte and time totals of the utils getters,
+    overall and per screen.
+
+    Bytes are estimated from the text protocol: each value costs its string
+    length plus a length byte, averaged over a sample of up to
+    ``sample_rows`` rows. Queries count towards the screen set with
+    ``screen()`` in the context they run in.
+    """
+
+    def __init__(self, sample_rows=100):
+        self.sample_rows = sample_rows
+        self._lock = threading.Lock()
+        self._queries = {}
+        self._screens = {}
+        self._screen = contextvars.ContextVar("query_screen", default=None)
+
+    @contextmanager
+    def screen(self, name):
+        """Attribute the queries run inside the block to a screen
+
+        Args:
+            name (str): screen name, e.g. the menu option
+        """
+        token = self._screen.set(name)
+        try:
+            yield
+        finally:
+            self._screen.reset(token)
+
+    def record(self, name, rows, seconds):
+        """Add one execution of a named query
+
+        Args:
+            name (str): query name, usually the getter's
+            rows (list | pd.DataFrame): fetched rows
+            seconds (float): execute and fetch time
+
+        Returns:
+            int: estimated bytes
+        """
+        estimated_bytes = self._estimate_bytes(rows)
+        screen = self._screen.get()
+        with self._lock:
+            scopes = [self._queries]
+            if screen is not None:
+                scopes.append(self._screens.setdefault(screen, {}))
+            for queries in scopes:
+                totals = queries.setdefault(
+                    name, {"calls": 0, "rows": 0, "bytes": 0, "seconds": 0.0}
+                )
+                totals["calls"] += 1
+                totals["rows"] += len(rows)
+                totals["bytes"] += estimated_bytes
+                totals["seconds"] += seconds
+        return estimated_bytes
+
+    def stats(self, screen=None):
+        """Snapshot of the per-query totals
+
+        Args:
+            screen (str): only the queries run for this screen, or None for all
+
+        Returns:
+            dict: query name -> calls, rows, bytes, seconds
+        """
+        with self._lock:
+            queries = self._queries if screen is None else self._screens.get(screen, {})
+            return {name: dict(totals) for name, totals in queries.items()}
+
+    def reset(self):
+        """Drop every total"""
+        with self._lock:
+            self._queries.clear()
+            self._screens.clear()
+
+    def _estimate_bytes(self, rows):
+        if not len(rows):
+            return 0
+        step = max(1, len(rows) // self.sample_rows)
+        if isinstance(rows, pd.DataFrame):
+            sample = list(rows.iloc[::step].itertuples(index=False, name=None))
+        else:
+            sample = rows[::step]
+        # NULLs (NaN once in a float column) travel as a single byte
+        sample_bytes = sum(
+            1 if value is None or value != value else len(str(value)) + 1
+            for row in sample
+            for value in row
+        )
+        return round(sample_bytes / len(sample) * len(rows))
+
+
+query_metrics = QueryMetrics()
+
+
+@contextmanager
+def statement_timeout(seconds):
+    """Have MySQL stop every SELECT that fetch_all and fetch_frame send
+    from this context once it runs longer than seconds
+
+    Args:
+        seconds (float): server-side time limit
+    """
+    token = _statement_timeout.set(seconds)
+    try:
+        yield
+    finally:
+        _statement_timeout.reset(token)
+
+
+def _limited(sql):
+    seconds = _statement_timeout.get()
+    if seconds is None:
+        return sql
+    # The optimizer hint costs no extra round trip, unlike SET SESSION
+    hint = f"SELECT /*+ MAX_EXECUTION_TIME({int(seconds * 1000)}) */"
+    return SELECT.sub(hint, sql, count=1)
+
+
+def fetch_all(cursor, name, query):
+    """Run a query and record its metrics under name
+
+    Args:
+        cursor (Cursor): open cursor
+        name (str): query name for query_metrics
+        query (Query | tuple): builder, or (sql, params) for hand-written SQL
+
+    Returns:
+        list: fetched rows
+    """
+    sql, params = query.render() if isinstance(query, Query) else query
+    start_time = time.time()
+    cursor.execute(_limited(sql), params)
+    rows = list(cursor.fetchall())
+    query_metrics.record(name, rows, time.time() - start_time)
+    return rows
+
+
+def fetch_frame(conn, name, query, columns=None, dtypes=SCHEMA):
+    """Run a query through models.fetch.read_frame, which fills typed NumPy
+    columns from a server-side cursor, and record its metrics under name
+
+    Args:
+        conn (Connection): pooled connection
+        name (str): query name for query_metrics
+        query (Query | tuple): builder, or (sql, params) for hand-written SQL
+        columns (list): frame column names, by default the cursor's
+        dtypes (dict): column -> dtype, see models.fetch.read_frame
+
+    Returns:
+        pd.DataFrame: fetched rows with the declared dtypes
+    """
+    sql, params = query.render() if isinstance(query, Query) else query
+    start_time = time.time()
+    df = read_frame(conn, _limited(sql), params, columns, dtypes)
+    query_metrics.record(name, df, time.time() - start_time)
+    return df
+
+
+def stream_frames(
+    conn, name, query, columns=None, dtypes=SCHEMA, chunk_rows=FETCH_CHUNK_ROWS
+):
+    """Stream a query through models.fetch.iter_frames, recording every
+    chunk's metrics under name
+
+    Args:
+        conn (Connection): pooled connection, busy until the stream ends
+        name (str): query name for query_metrics
+        query (Query | tuple): builder, or (sql, params) for hand-written SQL
+        columns (list): frame column names, by default the cursor's
+        dtypes (dict): column -> dtype, see models.fetch.read_frame
+        chunk_rows (int): rows per chunk
+
+    Yields:
+        pd.DataFrame: up to chunk_rows rows, name columns left uncategorized
+    """
+    sql, params = query.render() if isinstance(query, Query) else query
+    start_time = time.time()
+    for df in iter_frames(conn, sql, params, columns, dtypes, chunk_rows=chunk_rows):
+        query_metrics.record(name, df, time.time() - start_time)
+        yield df
+        start_time = time.time()
@@ -0,0 +1,287 @@
+import pandas as pd
+
+from models.franchises import get_franchise_id
+from ..query import fetch_frame
+
+# Deliveries of a team's batting (or bowling) innings, super overs excluded
+SIDE_DELIVERIES = """
+    FROM deliveries d INNER JOIN matches m ON d.match_id = m.id
+    WHERE d.{side}_id = %(team_id)s AND d.inning <= 2 {season_filter}
+"""
+
+BATTER_INNINGS = """
+    SELECT d.batter, d.match_id, SUM(d.batsman_runs) AS runs
+    {deliveries}
+    GROUP BY d.batter, d.match_id
+"""
+
+BATTER_QUERIES = {
+    "total_fours": """
+        SELECT d.batter, COUNT(*) AS total_fours
+        {deliveries} AND d.batsman_runs = 4
+        GROUP BY d.batter ORDER BY total_fours DESC LIMIT 10
+    """,
+    "fours_inning": """
+        SELECT d.batter, d.match_id, COUNT(*) AS total_fours
+        {deliveries} AND d.batsman_runs = 4
+        GROUP BY d.batter, d.match_id ORDER BY total_fours DESC LIMIT 10
+    """,
+    "total_sixes": """
+        SELECT d.batter, COUNT(*) AS total_sixes
+        {deliveries} AND d.batsman_runs = 6
+        GROUP BY d.batter ORDER BY total_sixes DESC LIMIT 10
+    """,
+    "sixes_inning": """
+        SELECT d.batter, d.match_id, COUNT(*) AS total_sixes
+        {deliveries} AND d.batsman_runs = 6
+        GROUP BY d.batter, d.match_id ORDER BY total_sixes DESC LIMIT 10
+    """,
+    "highest_score_inning": """
+        SELECT d.batter, SUM(d.batsman_runs) AS batsman_runs
+        {deliveries}
+        GROUP BY d.batter ORDER BY batsman_runs DESC LIMIT 10
+    """,
+    "total_runs": """
+        SELECT d.batter, d.match_id, SUM(d.batsman_runs) AS batsman_runs,
+            SUM(d.extras_type IS NULL OR d.extras_type <> 'wides') AS ball,
+            ROUND(SUM(d.batsman_runs)
+                / SUM(d.extras_type IS NULL OR d.extras_type <> 'wides') * 100, 2)
+                AS strike_rate
+        {deliveries}
+        GROUP BY d.batter, d.match_id ORDER BY batsman_runs DESC LIMIT 10
+    """,
+    "fifties": """
+        SELECT batter, COUNT(*) AS match_id, COUNT(*) AS batsman_runs
+        FROM ({innings}) AS innings
+        WHERE runs >= 50 AND runs < 100
+        GROUP BY batter ORDER BY batsman_runs DESC
+    """,
+    "centuries": """
+        SELECT batter, COUNT(*) AS match_id, COUNT(*) AS batsman_runs
+        FROM ({innings}) AS innings
+        WHERE runs >= 100
+        GROUP BY batter ORDER BY batsman_runs DESC
+    """,
+}
+
+BOWLER_FIGURES = """
+    SELECT {keys},
+        SUM(d.is_wicket = 1 AND d.dismissal_kind <> 'run out') AS total_wickets,
+        SUM(d.total_runs) AS total_runs,
+        SUM(d.extras_type IS NULL OR d.extras_type NOT IN ('wides', 'noballs'))
+            AS total_balls
+    {deliveries}
+    GROUP BY {keys}
+    HAVING total_wickets >= {min_wickets}
+"""
+
+BOWLER_QUERY = """
+    SELECT figures.*,
+        FLOOR(total_balls / 6) + MOD(total_balls, 6) / 10 AS overs,
+        ROUND(total_balls / total_wickets, 2) AS strike_rate,
+        ROUND(total_runs * 6 / NULLIF(total_balls, 0), 2) AS economy_rate
+    FROM ({figures}) AS figures
+    ORDER BY {order}
+"""
+
+BOWLER_KEYS = {
+    "wickets_total": "d.bowler",
+    "wickets_inning": "d.bowler, d.match_id",
+    "wicket_hauls": "d.bowler, d.match_id",
+}
+
+# Innings figures are only the best ones, plus every innings of four or more
+# wickets as the hauls, like views.team.player.bowler
+BOWLER_ORDER = {
+    "wickets_total": "total_wickets DESC, economy_rate ASC",
+    "wickets_inning": "total_wickets DESC, total_runs ASC LIMIT 10",
+    "wicket_hauls": "total_wickets DESC, total_runs ASC",
+}
+BOWLER_MIN_WICKETS = {"wicket_hauls": 4}
+
+# Reads of the summary tables built by models.summary
+SUMMARY_INNINGS = {
+    "batter_innings": """
+        SELECT s.batter, s.match_id, s.runs, s.balls, s.fours, s.sixes
+        FROM batter_innings s INNER JOIN matches m ON s.match_id = m.id
+        WHERE s.batting_team_id = %(team_id)s AND s.inning <= 2 {season_filter}
+        ORDER BY s.batter, s.match_id
+    """,
+    "bowler_innings": """
+        SELECT s.bowler, s.match_id, s.legal_balls, s.runs_conceded, s.wickets
+        FROM bowler_innings s INNER JOIN matches m ON s.match_id = m.id
+        WHERE s.bowling_team_id = %(team_id)s AND s.inning <= 2 {season_filter}
+        ORDER BY s.bowler, s.match_id
+    """,
+}
+
+NAME_COLUMNS = ("batter", "bowler")
+
+
+def _season_filter(season_from, season_to):
+    season_filter = ""
+    if season_from is not None:
+        season_filter += " AND m.season_key >= %(season_from)s"
+    if season_to is not None:
+        season_filter += " AND m.season_key <= %(season_to)s"
+    return season_filter
+
+
+def _side_deliveries(side, season_from, season_to):
+    return SIDE_DELIVERIES.format(
+        side=side, season_filter=_season_filter(season_from, season_to)
+    )
+
+
+def _params(cnx, team, season_from, season_to):
+    return {
+        "team_id": get_franchise_id(cnx, team),
+        "season_from": season_from,
+        "season_to": season_to,
+    }
+
+
+def batter_queries(season_from=None, season_to=None):
+    """Rendered batting leaderboard queries
+
+    Args:
+        season_from (int): earliest season key, or None for no lower bound
+        season_to (int): latest season key, or None for no upper bound
+
+    Returns:
+        dict: leaderboard name -> query with team_id, season_from and season_to params
+    """
+    deliveries = _side_deliveries("batting_team", season_from, season_to)
+    innings = BATTER_INNINGS.format(deliveries=deliveries)
+    return {
+        name: query.format(deliveries=deliveries, innings=innings)
+        for name, query in BATTER_QUERIES.items()
+    }
+
+
+def bowler_queries(season_from=None, season_to=None):
+    """Rendered bowling figures queries
+
+    Args:
+        season_from (int): earliest season key, or None for no lower bound
+        season_to (int): latest season key, or None for no upper bound
+
+    Returns:
+        dict: figures name -> query with team_id, season_from and season_to params
+    """
+    deliveries = _side_deliveries("bowling_team", season_from, season_to)
+    return {
+        name: BOWLER_QUERY.format(
+            figures=BOWLER_FIGURES.format(
+                keys=keys,
+                deliveries=deliveries,
+                min_wickets=BOWLER_MIN_WICKETS.get(name, 1),
+            ),
+            order=BOWLER_ORDER[name],
+        )
+        for name, keys in BOWLER_KEYS.items()
+    }
+
+
+def summary_queries(season_from=None, season_to=None):
+    """Rendered summary table reads
+
+    Args:
+        season_from (int): earliest season key, or None for no lower bound
+        season_to (int): latest season key, or None for no upper bound
+
+    Returns:
+        dict: table name -> query with team_id, season_from and season_to params
+    """
+    return {
+        name: query.format(season_filter=_season_filter(season_from, season_to))
+        for name, query in SUMMARY_INNINGS.items()
+    }
+
+
+def _fetch_frame(conn, name, query, params):
+    # Aggregates reuse per-ball column names, so the per-ball dtypes do not apply
+    df = fetch_frame(conn, name, (query, params), dtypes={})
+    # MySQL returns SUM/ROUND results as Decimal
+    for col in df.columns:
+        if col not in NAME_COLUMNS:
+            df[col] = pd.to_numeric(df[col])
+    return df
+
+
+def get_batter_stats(cnx, team, season_from=None, season_to=None):
+    """Batting leaderboards of a team aggregated inside MySQL
+
+    Args:
+        cnx (ConnectionPool): connection pool
+        team (str): team name
+        season_from (int): earliest season key, or None for every season
+        season_to (int): latest season key, or None for every season
+
+    Returns:
+        dict: leaderboard name -> DataFrame
+    """
+    try:
+        params = _params(cnx, team, season_from, season_to)
+
+        with cnx.connection() as conn:
+            data = {
+                name: _fetch_frame(conn, f"batter_stats.{name}", query, params)
+                for name, query in batter_queries(season_from, season_to).items()
+            }
+        return {"status": True, "message": "Batter stats fetched", "data": data}
+
+    except Exception as e:
+        return {"status": False, "message": e, "data": {}}
+
+
+def get_bowler_stats(cnx, team, season_from=None, season_to=None):
+    """Bowling figures of a team aggregated inside MySQL
+
+    Args:
+        cnx (ConnectionPool): connection pool
+        team (str): team name
+        season_from (int): earliest season key, or None for every season
+        season_to (int): latest season key, or None for every season
+
+    Returns:
+        dict: figures name -> DataFrame
+    """
+    try:
+        params = _params(cnx, team, season_from, season_to)
+
+        with cnx.connection() as conn:
+            data = {
+                name: _fetch_frame(conn, f"bowler_stats.{name}", query, params)
+                for name, query in bowler_queries(season_from, season_to).items()
+            }
+        return {"status": True, "message": "Bowler stats fetched", "data": data}
+
+    except Exception as e:
+        return {"status": False, "message": e, "data": {}}
+
+
+def get_innings_summary(cnx, team, season_from=None, season_to=None):
+    """Per-player-per-match rows of a team from the summary tables
+
+    Args:
+        cnx (ConnectionPool): connection pool
+        team (str): team name
+        season_from (int): earliest season key, or None for every season
+        season_to (int): latest season key, or None for every season
+
+    Returns:
+        dict: "batter_innings" and "bowler_innings" DataFrames
+    """
+    try:
+        params = _params(cnx, team, season_from, season_to)
+
+        with cnx.connection() as conn:
+            data = {
+                name: _fetch_frame(conn, f"innings_summary.{name}", query, params)
+                for name, query in summary_queries(season_from, season_to).items()
+            }
+        return {"status": True, "message": "Innings summary fetched", "data": data}
+
+    except Exception as e:
+        return {"status": False, "message": e, "data": {}}
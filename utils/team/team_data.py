@@ -1,21 +1,91 @@
-def get_team_data(cnx, team):
+from models import get_store
+from ..cache import cached_query
+from models.franchises import get_franchise_id
+from ..query import Query, fetch_frame
+from constants import MATCHES_COL, INNINGS_COL
+
+
+def team_matches_query(team_id, season_from=None, season_to=None):
+    """Matches of a franchise, MATCHES_COL"""
+    return (
+        Query("matches", MATCHES_COL)
+        .where("(`team1_id` = %s OR `team2_id` = %s)", team_id, team_id)
+        .where_season("season_key", season_from, season_to)
+    )
+
+
+def team_innings_query(team_id, season_from=None, season_to=None):
+    """Regular batting innings totals of a franchise, INNINGS_COL"""
+    return (
+        Query("innings", INNINGS_COL)
+        .join("matches", "`innings`.`match_id` = `matches`.`id`")
+        .where("`innings`.`batting_team_id` = %s", team_id)
+        .where("`innings`.`inning` <= 2")
+        .where_season("matches.season_key", season_from, season_to)
+    )
+
+
+@cached_query
+def get_team_data(cnx, team, season_from=None, season_to=None):
     """Getting matches from a team
 
     Args:
-        cnx (_type_): connection object
+        cnx (ConnectionPool): connection pool
         team (_type_): team name
+        season_from (int): earliest season key, or None for every season
+        season_to (int): latest season key, or None for every season
 
     Returns:
         _type_: dict
     """
 
     try:
-        cursor = cnx.cursor()
+        store = get_store()
+        if store.loaded:
+            mask = store.team_mask(team) & store.season_mask(season_from, season_to)
+            data = store.match_rows(mask)
+            return {"status": True, "message": "Data Fetched Successfully", "data": data}
+
+        with cnx.connection() as conn:
+            team_id = get_franchise_id(cnx, team)
+            data = fetch_frame(
+                conn,
+                "get_team_data",
+                team_matches_query(team_id, season_from, season_to),
+            )
+        return {"status": True, "message": "Data Fetched Successfully", "data": data}
+
+    except Exception as e:
+        return {"status": False, "message": e, "data": []}
+
+
+@cached_query
+def get_team_innings(cnx, team, season_from=None, season_to=None):
+    """Getting the batting innings totals of a team
+
+    Args:
+        cnx (ConnectionPool): connection pool
+        team (_type_): team name
+        season_from (int): earliest season key, or None for every season
+        season_to (int): latest season key, or None for every season
+
+    Returns:
+        _type_: dict, rows laid out as INNINGS_COL; super overs are left out
+    """
+
+    try:
+        store = get_store()
+        if store.loaded:
+            data = store.team_innings(team, season_from, season_to)
+            return {"status": True, "message": "Data Fetched Successfully", "data": data}
 
-        query = f"SELECT * FROM matches WHERE (team1 = '{team}' OR team2 = '{team}');"
-        cursor.execute(query)
-        data = cursor.fetchall()
-        data = [row[1:] for row in data]
+        with cnx.connection() as conn:
+            team_id = get_franchise_id(cnx, team)
+            data = fetch_frame(
+                conn,
+                "get_team_innings",
+                team_innings_query(team_id, season_from, season_to),
+            )
         return {"status": True, "message": "Data Fetched Successfully", "data": data}
 
     except Exception as e:
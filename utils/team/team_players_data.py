@@ -1,46 +1,221 @@
-# def get_team_players_data(cnx):
-#     """Getting players from a team
+import os
 
-#     Args:
-#         cnx (_type_): connection object
-#         team (_type_): team name
+import numpy as np
+import pandas as pd
 
-#     Returns:
-#         _type_: dict
-#     """
+from models import get_store
+from models.franchises import get_franchise_id
+from ..query import Query, fetch_all, fetch_frame, stream_frames
+from ..matches.head_to_head import PAIR_CONDITION
+from constants import PLAYERS_COL
 
-#     try:
-#         cursor = cnx.cursor()
+TEAM_SIDES = ("batting", "bowling")
+TEAM_CHUNK_MATCHES = int(os.getenv("TEAM_CHUNK_MATCHES", 50))
+# "batched": one indexed query per chunk of matches; "stream": one ordered
+# query read through a server-side cursor
+TEAM_DELIVERIES_MODES = ("batched", "stream")
+TEAM_DELIVERIES_MODE = os.getenv("TEAM_DELIVERIES_MODE", "batched")
 
-#         query = f"SELECT * FROM deliveries;"
-#         cursor.execute(query)
-#         data = cursor.fetchall()
-#         data = [row for row in data]
-#         return {"status": True, "message": "Data Fetched Successfully", "data": data}
 
-#     except Exception as e:
-#         return {"status": False, "message": e, "data": []}
+def team_players_query(team1_id, team2_id, season_from=None, season_to=None):
+    """Deliveries of the matches between two franchises, PLAYERS_COL"""
+    return (
+        Query("deliveries", PLAYERS_COL)
+        .join("matches", "`deliveries`.`match_id` = `matches`.`id`")
+        .where(PAIR_CONDITION, team1_id, team2_id, team2_id, team1_id)
+        .where_season("matches.season_key", season_from, season_to)
+    )
 
 
-def get_team_players_data(cnx, team1, team2):
+def team_match_ids_query(team_id, season_from=None, season_to=None):
+    """Ids of a franchise's matches"""
+    return (
+        Query("matches", ["id"])
+        .where("(`team1_id` = %s OR `team2_id` = %s)", team_id, team_id)
+        .where_season("season_key", season_from, season_to)
+        .order_by("id")
+    )
+
+
+def team_deliveries_query(match_ids, team_id=None, side=None):
+    """Deliveries of the given matches, PLAYERS_COL; with a side, only the
+    franchise's regular innings on that side"""
+    query = Query("deliveries", PLAYERS_COL).where_in("match_id", match_ids)
+    if side is not None:
+        _where_side(query, team_id, side)
+    return query
+
+
+def team_stream_query(team_id, side=None, season_from=None, season_to=None):
+    """Deliveries of a franchise's matches ordered by match, PLAYERS_COL;
+    with a side, only its regular innings on that side"""
+    query = Query("deliveries", PLAYERS_COL).join(
+        "matches", "`deliveries`.`match_id` = `matches`.`id`"
+    )
+    if side is None:
+        query.where(
+            "(`matches`.`team1_id` = %s OR `matches`.`team2_id` = %s)",
+            team_id,
+            team_id,
+        )
+    else:
+        _where_side(query, team_id, side)
+    query.where_season("matches.season_key", season_from, season_to)
+    return query.order_by("match_id")
+
+
+def _where_side(query, team_id, side):
+    query.where_equal(f"deliveries.{side}_team_id", team_id)
+    query.where("`deliveries`.`inning` <= 2")
+
+
+def get_team_players_data(cnx, team1, team2, season_from=None, season_to=None):
     """Getting players from a team
 
     Args:
-        cnx (_type_): connection object
+        cnx (ConnectionPool): connection pool
         team (_type_): team name
+        season_from (int): earliest season key, or None for every season
+        season_to (int): latest season key, or None for every season
 
     Returns:
-        _type_: dict
+        _type_: dict, rows laid out as PLAYERS_COL; the match columns are
+        fetched once per match by get_head_to_head_data and added with
+        join_matches
     """
 
     try:
-        cursor = cnx.cursor()
+        store = get_store()
+        if store.loaded:
+            mask = store.pair_mask(team1, team2) & store.season_mask(
+                season_from, season_to
+            )
+            data = store.match_deliveries(store.matches["id"][mask])
+            return {"status": True, "message": "Data Fetched Successfully", "data": data}
 
-        query = f"SELECT * FROM deliveries INNER JOIN matches ON deliveries.match_id = matches.id WHERE (matches.team1 = '{team1}' AND matches.team2 = '{team2}') OR (matches.team1 = '{team2}' AND matches.team2 = '{team1}');"
-        cursor.execute(query)
-        data = cursor.fetchall()
-        data = [row for row in data]
+        with cnx.connection() as conn:
+            team1_id = get_franchise_id(cnx, team1)
+            team2_id = get_franchise_id(cnx, team2)
+            data = fetch_frame(
+                conn,
+                "get_team_players_data",
+                team_players_query(team1_id, team2_id, season_from, season_to),
+            )
         return {"status": True, "message": "Data Fetched Successfully", "data": data}
 
     except Exception as e:
         return {"status": False, "message": e, "data": []}
+
+
+def iter_team_deliveries(
+    cnx,
+    team,
+    side=None,
+    season_from=None,
+    season_to=None,
+    chunk_matches=TEAM_CHUNK_MATCHES,
+    mode=None,
+):
+    """Stream the deliveries of a team's matches a few matches at a time.
+    A match never spans two chunks, so per-match aggregates can be built
+    chunk by chunk.
+
+    Args:
+        cnx (ConnectionPool): connection pool
+        team (_type_): team name
+        side (str): "batting" or "bowling" for that side's innings only (super
+            overs left out), or None for every innings of the team's matches
+        season_from (int): earliest season key, or None for every season
+        season_to (int): latest season key, or None for every season
+        chunk_matches (int): matches per chunk, in "batched" mode and from
+            the data store
+        mode (str): "batched" or "stream", TEAM_DELIVERIES_MODE by default;
+            "stream" holds a dedicated pooled connection until the stream ends
+
+    Yields:
+        _type_: DataFrame (MySQL) or column arrays (data store) over PLAYERS_COL
+    """
+    if side is not None and side not in TEAM_SIDES:
+        raise ValueError(f"side must be one of {TEAM_SIDES} or None, got {side!r}")
+
+    store = get_store()
+    if store.loaded:
+        positions = store.team_positions(team, side, season_from, season_to)
+        if not len(positions):
+            return
+        match_ids = store.deliveries["match_id"][positions]
+        starts = np.flatnonzero(np.diff(match_ids, prepend=-1))
+        for bounds in np.split(positions, starts[chunk_matches::chunk_matches]):
+            yield {col: store.deliveries[col][bounds] for col in PLAYERS_COL}
+        return
+
+    mode = mode or TEAM_DELIVERIES_MODE
+    if mode not in TEAM_DELIVERIES_MODES:
+        raise ValueError(f"mode must be one of {TEAM_DELIVERIES_MODES}, got {mode!r}")
+
+    team_id = get_franchise_id(cnx, team)
+    if mode == "stream":
+        yield from _stream_team_deliveries(cnx, team_id, side, season_from, season_to)
+        return
+
+    with cnx.connection() as conn:
+        cursor = conn.cursor()
+        match_ids = fetch_all(
+            cursor,
+            "iter_team_deliveries.matches",
+            team_match_ids_query(team_id, season_from, season_to),
+        )
+    match_ids = [row[0] for row in match_ids]
+
+    for start in range(0, len(match_ids), chunk_matches):
+        chunk = match_ids[start : start + chunk_matches]
+        # The connection goes back to the pool while the caller works on a chunk
+        with cnx.connection() as conn:
+            data = fetch_frame(
+                conn,
+                "iter_team_deliveries",
+                team_deliveries_query(chunk, team_id, side),
+            )
+        yield data
+
+
+def _stream_team_deliveries(cnx, team_id, side, season_from, season_to):
+    # Rows arrive ordered by match; the last match of every chunk is held
+    # back until the next chunk completes it. The stream has a connection of
+    # its own, so the caller can keep querying through the thread's lease
+    # while the server-side cursor is still open
+    query = team_stream_query(team_id, side, season_from, season_to)
+    held = None
+    with cnx.dedicated() as conn:
+        for df in stream_frames(conn, "iter_team_deliveries.stream", query):
+            if held is not None:
+                df = pd.concat([held, df], ignore_index=True)
+            last_match = (df["match_id"] == df["match_id"].iat[-1]).to_numpy()
+            held = df[last_match]
+            if not last_match.all():
+                yield df[~last_match]
+    if held is not None:
+        yield held
+
+
+def join_matches(deliveries_df, matches_df):
+    """Add the match columns to deliveries through an integer match index,
+    like an inner join of deliveries and matches on the match id
+
+    Args:
+        deliveries_df (pd.DataFrame): deliveries with PLAYERS_COL
+        matches_df (pd.DataFrame): one row per match with MATCHES_COL
+
+    Returns:
+        pd.DataFrame: PLAYERS_COL followed by the match columns other than id
+    """
+    position = pd.Index(matches_df["id"]).get_indexer(deliveries_df["match_id"])
+    found = position >= 0
+    match_columns = matches_df.drop(columns="id").take(position[found])
+    return pd.concat(
+        [
+            deliveries_df[found].reset_index(drop=True),
+            match_columns.reset_index(drop=True),
+        ],
+        axis=1,
+    )
@@ -1,2 +1,3 @@
 from .team.analysis import get_team_analysis
-from .matches.head_to_head import head_to_head_insights
\ No newline at end of file
+from .matches.head_to_head import head_to_head_insights
+from .outcomes import get_outcome_breakdown, get_team_outcomes
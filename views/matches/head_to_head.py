@@ -3,49 +3,36 @@ import streamlit as st
 
 from utils import get_head_to_head_data
 from constants import MATCHES_COL, PLAYERS_COL
-from utils import get_team_players_data
-
-
-def get_home(team_name):
-    franchise_home_cities = {
-        "Royal Challengers Bangalore": "Bangalore",
-        "Punjab Kings": "Chandigarh",
-        "Delhi Capitals": "Delhi",
-        "Mumbai Indians": "Mumbai",
-        "Kolkata Knight Riders": "Kolkata",
-        "Rajasthan Royals": "Jaipur",
-        "Deccan Chargers": "Hyderabad",
-        "Chennai Super Kings": "Chennai",
-        "Kochi Tuskers Kerala": "Kochi",
-        "Pune Warriors": "Pune",
-        "Sunrisers Hyderabad": "Hyderabad",
-        "Gujarat Lions": "Rajkot",
-        "Rising Pune Supergiants": "Pune",
-        "Lucknow Super Giants": "Lucknow",
-        "Gujarat Titans": "Ahmedabad",
-    }
-    return franchise_home_cities[team_name]
-
+from constants.schema import make_frame
+from utils import get_team_players_data, join_matches, run_concurrently
+from ..outcomes import get_outcome_breakdown, get_team_outcomes
+from .matrix import get_head_to_head_matrix
 
-def get_head_to_head_analysis(data, player_response, team1, team2, season):
-    df = pd.DataFrame(data, columns=MATCHES_COL)
-    player_df = pd.DataFrame(
-        player_response["data"], columns=PLAYERS_COL + ["match_id"] + MATCHES_COL
-    )
 
-    if season != "All Seasons":
-        df = df[df["season"] >= season]
-        player_df = player_df[player_df["season"] >= season]
+def get_head_to_head_analysis(data, player_response, team1, team2, outcomes=None):
+    df = make_frame(data, MATCHES_COL)
+    # Match columns travel once per match and are joined on here
+    player_df = join_matches(make_frame(player_response["data"], PLAYERS_COL), df)
 
     df.to_csv("views/matches/head_to_head.csv")
     player_df.to_csv("views/matches/players.csv")
 
+    # Counts come from the precomputed matrix when the caller has the cell,
+    # otherwise from one winner x home side crosstab
+    if outcomes is None:
+        breakdown = get_outcome_breakdown(df)
+        outcomes = (
+            get_team_outcomes(breakdown, team1, opponent=team2),
+            get_team_outcomes(breakdown, team2, opponent=team1),
+        )
+    team1_outcomes, team2_outcomes = outcomes
+
     # Overall analysis
     overall_analysis = {
         "total_matches_played": len(df),
-        "won_by_team1": len(df[df["winner"] == team1]),
-        "won_by_team2": len(df[df["winner"] == team2]),
-        "drawn": len(df[df["winner"].isnull()]),
+        "won_by_team1": team1_outcomes["wins"],
+        "won_by_team2": team2_outcomes["wins"],
+        "drawn": team1_outcomes["no_results"],
         "won_dataframe_team1": df[df["winner"] == team1][
             [
                 "season",
@@ -71,45 +58,14 @@ def get_head_to_head_analysis(data, player_response, team1, team2, season):
     }
 
     # Home & Away Analysis
-    home_won_by_team1 = len(
-        df[(df["winner"] == team1) & (df["city"] == get_home(team1))]
-    )
-    home_loss_by_team1 = len(
-        df[(df["winner"] == team2) & (df["city"] == get_home(team1))]
-    )
-    away_won_by_team1 = len(
-        df[(df["winner"] == team1) & (df["city"] != get_home(team1))]
-    )
-    away_loss_by_team1 = len(
-        df[(df["winner"] == team2) & (df["city"] != get_home(team1))]
-    )
-
-    home_won_by_team2 = len(
-        df[(df["winner"] == team2) & (df["city"] == get_home(team2))]
-    )
-    home_loss_by_team2 = len(
-        df[(df["winner"] == team1) & (df["city"] == get_home(team2))]
-    )
-    away_won_by_team2 = len(
-        df[(df["winner"] == team2) & (df["city"] != get_home(team2))]
-    )
-    away_loss_by_team2 = len(
-        df[(df["winner"] == team1) & (df["city"] != get_home(team2))]
-    )
-
     home_away_data = {
-        "team1": {
-            "home_wins": home_won_by_team1,
-            "home_losses": home_loss_by_team1,
-            "away_wins": away_won_by_team1,
-            "away_losses": away_loss_by_team1,
-        },
-        "team2": {
-            "home_wins": home_won_by_team2,
-            "home_losses": home_loss_by_team2,
-            "away_wins": away_won_by_team2,
-            "away_losses": away_loss_by_team2,
-        },
+        team: {
+            "home_wins": outcomes["home_wins"],
+            "home_losses": outcomes["home_losses"],
+            "away_wins": outcomes["away_wins"],
+            "away_losses": outcomes["away_losses"],
+        }
+        for team, outcomes in (("team1", team1_outcomes), ("team2", team2_outcomes))
     }
 
     # Match Statistics
@@ -136,26 +92,42 @@ def get_head_to_head_analysis(data, player_response, team1, team2, season):
     }
 
 
-def head_to_head_insights(cnx, team1, team2, season):
+def head_to_head_insights(cnx, team1, team2, season=None):
+    # season is the earliest season key to include, None for every season
 
     if team1 == team2:
         return {"status": False, "message": "Teams are the same", "data": []}
 
-    response = get_head_to_head_data(cnx, team1, team2)
-    player_response = get_team_players_data(cnx, team1, team2)
+    # The matches lookup and the deliveries join run side by side
+    results = run_concurrently(
+        {
+            "matches": (get_head_to_head_data, (cnx, team1, team2, season)),
+            "players": (get_team_players_data, (cnx, team1, team2, season)),
+        }
+    )
+    response = results["data"].get(
+        "matches",
+        {"status": False, "message": results["errors"].get("matches"), "data": []},
+    )
+    player_response = results["data"].get("players", {"status": False, "data": []})
 
     try:
 
         if response["status"] == False:
             return response
         else:
+            if not player_response["status"]:
+                player_response = {**player_response, "data": []}
+            matrix = get_head_to_head_matrix()
+            outcomes = matrix.lookup(team1, team2, season) if matrix else None
             insights = get_head_to_head_analysis(
-                response["data"], player_response, team1, team2, season
+                response["data"], player_response, team1, team2, outcomes
             )
             return {
                 "status": True,
                 "message": "Insights fetched successfully",
                 "data": insights,
+                "errors": results["errors"],
             }
     except Exception as e:
         return {"status": False, "message": e, "data": []}
@@ -0,0 +1,157 @@
+import time
+import threading
+
+import numpy as np
+import pandas as pd
+
+from models import get_store
+from ..outcomes import with_home_side
+
+# Per-cell counts, from the first team's point of view
+OUTCOMES = (
+    "wins",
+    "losses",
+    "no_results",
+    "home_wins",
+    "home_losses",
+    "away_wins",
+    "away_losses",
+)
+
+
+class HeadToHeadMatrix:
+    """Head-to-head results of every ordered franchise pair for every
+    "since season" cutoff.
+
+    ``counts[i, j, s]`` holds the OUTCOMES of franchise i against franchise j
+    over the seasons from ``season_keys[s]`` onwards, so any page query is a
+    single read.
+    """
+
+    def __init__(self, franchise_ids, season_keys, counts):
+        self.franchise_ids = franchise_ids
+        self.season_keys = season_keys
+        self.counts = counts
+
+    @classmethod
+    def from_store(cls, store):
+        """Build the matrix in one pass over the store's matches
+
+        Args:
+            store (DataStore): loaded data store
+
+        Returns:
+            HeadToHeadMatrix: counts for every pair and cutoff
+        """
+        matches = store.matches
+        franchise_ids = store.franchises["ids"]
+        ids = sorted(set(franchise_ids.values()))
+        position = np.full(max(ids, default=0) + 1, -1, dtype=np.intp)
+        position[ids] = np.arange(len(ids))
+
+        team1_id = matches["team1_id"].astype(np.intp)
+        team2_id = matches["team2_id"].astype(np.intp)
+        winner_id = matches["winner_id"]
+        season_keys, season = np.unique(matches["season_key"], return_inverse=True)
+
+        home_side = with_home_side(
+            pd.DataFrame({col: matches[col] for col in ("team1", "team2", "city")})
+        )["is_home_for"].to_numpy(dtype=object)
+        team1_home = home_side == matches["team1"]
+        team2_home = home_side == matches["team2"]
+
+        team1_won = winner_id == team1_id
+        team2_won = winner_id == team2_id
+        no_result = np.isnan(winner_id.astype("float64"))
+
+        def outcomes(won, lost, home):
+            return np.column_stack(
+                [
+                    won,
+                    lost,
+                    no_result,
+                    won & home,
+                    lost & home,
+                    won & ~home,
+                    lost & ~home,
+                ]
+            )
+
+        counts = np.zeros(
+            (len(ids), len(ids), len(season_keys), len(OUTCOMES)), np.int16
+        )
+        team1, team2 = position[team1_id], position[team2_id]
+        known = (team1 >= 0) & (team2 >= 0)
+        for first, second, values in (
+            (team1, team2, outcomes(team1_won, team2_won, team1_home)),
+            (team2, team1, outcomes(team2_won, team1_won, team2_home)),
+        ):
+            np.add.at(
+                counts, (first[known], second[known], season[known]), values[known]
+            )
+
+        # Suffix sums over seasons turn per-season counts into "since" counts
+        counts = counts[:, :, ::-1].cumsum(axis=2, dtype=np.int16)[:, :, ::-1]
+        lookup = {
+            name: position[franchise_id] for name, franchise_id in franchise_ids.items()
+        }
+        return cls(lookup, season_keys, np.ascontiguousarray(counts))
+
+    def lookup(self, team1, team2, season_from=None):
+        """Outcomes of both teams of a pair since a season
+
+        Args:
+            team1 (str): team 1 name
+            team2 (str): team 2 name
+            season_from (int): earliest season key, or None for every season
+
+        Returns:
+            tuple: team 1 and team 2 outcome dicts shaped like
+            views.outcomes.get_team_outcomes, or None when a team is unknown
+        """
+        first = self.franchise_ids.get(team1)
+        second = self.franchise_ids.get(team2)
+        if first is None or second is None:
+            return None
+
+        cutoff = 0
+        if season_from is not None:
+            cutoff = int(np.searchsorted(self.season_keys, season_from))
+        if cutoff == len(self.season_keys):
+            cells = np.zeros((2, len(OUTCOMES)), dtype=np.int16)
+        else:
+            cells = self.counts[[first, second], [second, first], cutoff]
+
+        results = []
+        for cell in cells.tolist():
+            outcomes = dict(zip(OUTCOMES, cell))
+            outcomes["matches"] = (
+                outcomes["wins"] + outcomes["losses"] + outcomes["no_results"]
+            )
+            results.append(outcomes)
+        return tuple(results)
+
+
+_lock = threading.Lock()
+_matrix = {"loaded_at": None, "matrix": None}
+
+
+def get_head_to_head_matrix():
+    """Matrix for the current store load, built on first use after each load
+
+    Returns:
+        HeadToHeadMatrix: shared matrix, or None when the store is not loaded
+    """
+    store = get_store()
+    if not store.loaded:
+        return None
+
+    with _lock:
+        if _matrix["loaded_at"] != store.loaded_at:
+            start_time = time.time()
+            _matrix["matrix"] = HeadToHeadMatrix.from_store(store)
+            _matrix["loaded_at"] = store.loaded_at
+            print(
+                f"Head-to-head matrix built in {time.time() - start_time:.2f} seconds"
+            )
+        return _matrix["matrix"]
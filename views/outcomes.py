@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+from constants import FRANCHISE_HOME_CITIES
+
+# Row label for matches without a winner, column label for neutral venues
+NO_RESULT = "No result"
+NEUTRAL = "Neutral"
+
+
+def with_home_side(df):
+    """Copy of a matches frame with an is_home_for column naming the team
+    playing in its home city, or NEUTRAL
+
+    Args:
+        df (pd.DataFrame): matches with team1, team2 and city
+
+    Returns:
+        pd.DataFrame: df plus is_home_for
+    """
+    city = df["city"].to_numpy(dtype=object)
+    is_home_for = np.full(len(df), NEUTRAL, dtype=object)
+    # team1 is written last so it wins when both teams share a city
+    for col in ("team2", "team1"):
+        teams = df[col].to_numpy(dtype=object)
+        homes = df[col].map(FRANCHISE_HOME_CITIES).to_numpy(dtype=object)
+        at_home = pd.notna(homes) & (homes == city)
+        is_home_for[at_home] = teams[at_home]
+    return df.assign(is_home_for=is_home_for)
+
+
+def get_outcome_breakdown(df):
+    """Match counts by winner and home side, from a single crosstab
+
+    Args:
+        df (pd.DataFrame): matches with winner and is_home_for (added with
+            with_home_side when missing)
+
+    Returns:
+        pd.DataFrame: counts indexed by winner (NO_RESULT for no winner) with
+        one column per is_home_for value
+    """
+    if "is_home_for" not in df:
+        df = with_home_side(df)
+    winner = df["winner"].astype(object).fillna(NO_RESULT).to_numpy()
+    return pd.crosstab(
+        winner,
+        df["is_home_for"].to_numpy(dtype=object),
+        rownames=["winner"],
+        colnames=["is_home_for"],
+    )
+
+
+def get_team_outcomes(breakdown, team, opponent=None, no_result_is_loss=False):
+    """A team's results read off an outcome breakdown
+
+    Args:
+        breakdown (pd.DataFrame): result of get_outcome_breakdown
+        team (str): team name
+        opponent (str): only count losses to this team; any other winner
+            counts when None
+        no_result_is_loss (bool): count matches without a winner as losses
+            too, i.e. every match the team did not win; only without opponent
+
+    Returns:
+        dict: matches, wins, losses, no_results and home/away wins and losses
+    """
+    home = breakdown.columns == team
+    if opponent is None:
+        not_lost = [team] if no_result_is_loss else [team, NO_RESULT]
+        lost = ~breakdown.index.isin(not_lost)
+    else:
+        lost = breakdown.index == opponent
+    won = breakdown.index == team
+
+    counts = breakdown.to_numpy()
+    return {
+        "matches": int(counts.sum()),
+        "wins": int(counts[won].sum()),
+        "losses": int(counts[lost].sum()),
+        "no_results": int(counts[breakdown.index == NO_RESULT].sum()),
+        "home_wins": int(counts[won][:, home].sum()),
+        "home_losses": int(counts[lost][:, home].sum()),
+        "away_wins": int(counts[won][:, ~home].sum()),
+        "away_losses": int(counts[lost][:, ~home].sum()),
+    }
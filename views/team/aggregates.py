@@ -0,0 +1,276 @@
+import time
+import threading
+
+import numpy as np
+import pandas as pd
+
+from models import get_store
+
+TEAM_METRICS = (
+    "matches",
+    "wins",
+    "tosses",
+    "toss_and_match_wins",
+    "super_overs",
+    "super_over_wins",
+    "finals",
+    "final_wins",
+)
+BATTING_METRICS = ("runs", "balls", "fours", "sixes")
+BOWLING_METRICS = ("legal_balls", "runs_conceded", "wickets")
+PLAYER_METRICS = {"batting": BATTING_METRICS, "bowling": BOWLING_METRICS}
+
+
+def get_team_totals(df, team):
+    """TEAM_METRICS of a team counted from its matches frame, for when no
+    precomputed aggregates are available
+
+    Args:
+        df (pd.DataFrame): the team's matches
+        team (str): team name
+
+    Returns:
+        dict: metric -> count
+    """
+    won = df["winner"] == team
+    won_toss = df["toss_winner"] == team
+    super_over = df["super_over"] == "Y"
+    final = df["match_type"] == "Final"
+    return {
+        "matches": len(df),
+        "wins": int(won.sum()),
+        "tosses": int(won_toss.sum()),
+        "toss_and_match_wins": int((won_toss & won).sum()),
+        "super_overs": int(super_over.sum()),
+        "super_over_wins": int((super_over & won).sum()),
+        "finals": int(final.sum()),
+        "final_wins": int((final & won).sum()),
+    }
+
+
+class SeasonAggregates:
+    """Per-season team and player totals in suffix-cumulative form.
+
+    Every array has a season axis where position s holds the totals of the
+    seasons from ``season_keys[s]`` onwards, so a "since season" query is a
+    single read. Per-season blocks are kept so that a refresh which only
+    appends matches recomputes just the seasons those matches belong to.
+    """
+
+    def __init__(self):
+        self.max_match_id = None
+        self.season_keys = np.empty(0, dtype=np.int16)
+        self.franchise_ids = {}
+        self.teams = np.zeros((0, 0, len(TEAM_METRICS)), dtype=np.int32)
+        self.players = {}
+        self._seasons = {}
+
+    def update(self, store):
+        """Bring the aggregates up to date with the store
+
+        Args:
+            store (DataStore): loaded data store
+
+        Returns:
+            list: season keys that were recomputed
+        """
+        match_ids = store.matches["id"]
+        season_keys = store.matches["season_key"]
+        max_match_id = int(match_ids.max()) if len(match_ids) else 0
+
+        if self.max_match_id is None or max_match_id < self.max_match_id:
+            changed = np.unique(season_keys)
+            self._seasons = {}
+        else:
+            # Only seasons that received new matches need recomputing
+            changed = np.unique(season_keys[match_ids > self.max_match_id])
+
+        if len(changed):
+            self._seasons.update(_season_blocks(store, changed))
+        for season_key in set(self._seasons) - set(np.unique(season_keys).tolist()):
+            del self._seasons[season_key]
+
+        self.max_match_id = max_match_id
+        self.franchise_ids = dict(store.franchises["ids"])
+        self._accumulate()
+        return changed.tolist()
+
+    def team_totals(self, team, season_from=None):
+        """TEAM_METRICS of a team since a season
+
+        Args:
+            team (str): team name
+            season_from (int): earliest season key, or None for every season
+
+        Returns:
+            dict: metric -> count, or None when the team is unknown
+        """
+        franchise_id = self.franchise_ids.get(team)
+        if franchise_id is None or franchise_id >= len(self.teams):
+            return None
+        cutoff = self._cutoff(season_from)
+        if cutoff == len(self.season_keys):
+            return dict.fromkeys(TEAM_METRICS, 0)
+        return dict(zip(TEAM_METRICS, self.teams[franchise_id, cutoff].tolist()))
+
+    def player_totals(self, team, side, season_from=None):
+        """Batting or bowling totals of a team's players since a season
+
+        Args:
+            team (str): team name
+            side (str): "batting" (BATTING_METRICS) or "bowling" (BOWLING_METRICS)
+            season_from (int): earliest season key, or None for every season
+
+        Returns:
+            pd.DataFrame: one row per player with any activity since the cutoff
+        """
+        player = "batter" if side == "batting" else "bowler"
+        block = self.players[side]
+        franchise_id = self.franchise_ids.get(team, -1)
+        start, end = np.searchsorted(
+            block["team_ids"], [franchise_id, franchise_id + 1]
+        )
+
+        cutoff = self._cutoff(season_from)
+        if cutoff == len(self.season_keys):
+            return pd.DataFrame(columns=[player, *PLAYER_METRICS[side]])
+        values = block["values"][start:end, cutoff]
+        active = values.any(axis=1)
+        df = pd.DataFrame(values[active], columns=list(PLAYER_METRICS[side]))
+        df.insert(0, player, block["players"][start:end][active])
+        return df
+
+    def _cutoff(self, season_from):
+        if season_from is None:
+            return 0
+        return int(np.searchsorted(self.season_keys, season_from))
+
+    def _accumulate(self):
+        self.season_keys = np.array(sorted(self._seasons), dtype=np.int16)
+        blocks = [self._seasons[key] for key in self.season_keys.tolist()]
+
+        size = max((len(block["teams"]) for block in blocks), default=0)
+        teams = np.zeros((size, len(blocks), len(TEAM_METRICS)), dtype=np.int32)
+        for s, block in enumerate(blocks):
+            teams[: len(block["teams"]), s] = block["teams"]
+        self.teams = _suffix_sum(teams)
+
+        self.players = {}
+        for side, metrics in PLAYER_METRICS.items():
+            frames = [block[side] for block in blocks]
+            keys = pd.MultiIndex.from_tuples(
+                sorted(set().union(*(frame.index for frame in frames))),
+                names=["team_id", "player"],
+            )
+            values = np.zeros((len(keys), len(blocks), len(metrics)), dtype=np.int32)
+            for s, frame in enumerate(frames):
+                values[keys.get_indexer(frame.index), s] = frame.to_numpy()
+            self.players[side] = {
+                "team_ids": keys.get_level_values("team_id").to_numpy(),
+                "players": keys.get_level_values("player").to_numpy(dtype=object),
+                "values": _suffix_sum(values),
+            }
+
+
+def _suffix_sum(values):
+    return values[:, ::-1].cumsum(axis=1)[:, ::-1]
+
+
+def _season_blocks(store, season_keys):
+    matches = store.matches
+    size = int(max(store.franchises["ids"].values(), default=0)) + 1
+
+    blocks = {}
+    for season_key in season_keys.tolist():
+        rows = matches["season_key"] == season_key
+        teams = np.zeros((size, len(TEAM_METRICS)), dtype=np.int32)
+        for col in ("team1_id", "team2_id"):
+            team_id = matches[col][rows].astype(np.intp)
+            won = matches["winner_id"][rows] == team_id
+            won_toss = matches["toss_winner_id"][rows] == team_id
+            super_over = matches["super_over"][rows] == "Y"
+            final = matches["match_type"][rows] == "Final"
+            values = np.column_stack(
+                [
+                    np.ones(len(team_id), dtype=bool),
+                    won,
+                    won_toss,
+                    won_toss & won,
+                    super_over,
+                    super_over & won,
+                    final,
+                    final & won,
+                ]
+            )
+            np.add.at(teams, team_id, values)
+        blocks[season_key] = {"teams": teams}
+
+    # Season of every delivery, through a sorted join on match id
+    deliveries = store.deliveries
+    order = np.argsort(matches["id"], kind="stable")
+    positions = order[
+        np.searchsorted(matches["id"], deliveries["match_id"], sorter=order)
+    ]
+    keep = np.isin(matches["season_key"][positions], season_keys) & (
+        deliveries["inning"] <= 2
+    )
+    season = matches["season_key"][positions][keep]
+    runs = deliveries["batsman_runs"][keep].astype(np.int64)
+    extras_type = pd.Series(deliveries["extras_type"][keep])
+    batting = pd.DataFrame(
+        {
+            "season": season,
+            "team_id": deliveries["batting_team_id"][keep],
+            "player": deliveries["batter"][keep],
+            "runs": runs,
+            "balls": (extras_type != "wides").to_numpy(),
+            "fours": runs == 4,
+            "sixes": runs == 6,
+        }
+    )
+    bowling = pd.DataFrame(
+        {
+            "season": season,
+            "team_id": deliveries["bowling_team_id"][keep],
+            "player": deliveries["bowler"][keep],
+            "legal_balls": (~extras_type.isin(["wides", "noballs"])).to_numpy(),
+            "runs_conceded": deliveries["total_runs"][keep].astype(np.int64),
+            "wickets": (deliveries["is_wicket"][keep] == 1)
+            & (deliveries["dismissal_kind"][keep] != "run out"),
+        }
+    )
+    for side, frame in (("batting", batting), ("bowling", bowling)):
+        totals = frame.groupby(["season", "team_id", "player"]).sum()
+        for season_key in season_keys.tolist():
+            if season_key in totals.index.get_level_values("season"):
+                blocks[season_key][side] = totals.xs(season_key, level="season")
+            else:
+                blocks[season_key][side] = totals.iloc[:0].droplevel("season")
+    return blocks
+
+
+_lock = threading.Lock()
+_aggregates = {"loaded_at": None, "aggregates": SeasonAggregates()}
+
+
+def get_season_aggregates():
+    """Aggregates for the current store load, updated on first use after
+    each load
+
+    Returns:
+        SeasonAggregates: shared aggregates, or None when the store is not loaded
+    """
+    store = get_store()
+    if not store.loaded:
+        return None
+
+    with _lock:
+        if _aggregates["loaded_at"] != store.loaded_at:
+            start_time = time.time()
+            changed = _aggregates["aggregates"].update(store)
+            _aggregates["loaded_at"] = store.loaded_at
+            print(
+                f"Season aggregates updated for {len(changed)} seasons "
+                f"in {time.time() - start_time:.2f} seconds"
+            )
+        return _aggregates["aggregates"]
@@ -1,244 +1,292 @@
+import os
+import numpy as np
 import pandas as pd
+from collections.abc import Mapping
 import streamlit as st
-import traceback
-from constants import MATCHES_COL, PLAYERS_COL
-from utils import get_team_data
+from constants import MATCHES_COL, PLAYERS_COL, INNINGS_COL
+from constants.schema import make_frame, decategorize
+from utils import (
+    get_team_data,
+    get_team_innings,
+    iter_team_deliveries,
+    get_batter_stats,
+    get_bowler_stats,
+    get_innings_summary,
+)
+from ..outcomes import get_outcome_breakdown, get_team_outcomes
+from .aggregates import get_season_aggregates, get_team_totals
 from .player.batter import *
 from .player.bowler import *
 
 
-def my_func(x):
-    if x["winner"] == x["toss_winner"]:
-        return (
-            x["target_runs"]
-            if x["result"] != "runs"
-            else x["target_runs"] + x["result_margin"]
+def get_players_analysis_pandas(cnx, team, season):
+    """Player leaderboards aggregated with pandas (PLAYER_STATS_ENGINE=pandas).
+    Deliveries arrive a few matches at a time and each chunk's innings are
+    folded into bounded partial aggregates, so memory does not grow with
+    the team's history."""
+    sides = {
+        "batting": (get_batter_innings, fold_batter_innings),
+        "bowling": (get_bowler_innings, fold_bowler_innings),
+    }
+    partials = {}
+    try:
+        for side, (builder, fold) in sides.items():
+            partial = None
+            for chunk in iter_team_deliveries(cnx, team, side, season_from=season):
+                partial = fold(partial, builder(make_frame(chunk, PLAYERS_COL)))
+            if partial is None:
+                partial = fold(None, builder(make_frame([], PLAYERS_COL)))
+            partials[side] = partial
+    except Exception as e:
+        print(f"Team deliveries fetch failed: {e}")
+        return None
+
+    return {
+        "batter_analysis": {
+            name: decategorize(df)
+            for name, df in get_batting_leaderboards_from(partials["batting"]).items()
+        },
+        "bowler_analysis": {
+            name: decategorize(df)
+            for name, df in get_bowling_figures_from(partials["bowling"]).items()
+        },
+    }
+
+
+def get_players_analysis_sql(cnx, team, season):
+    """Player leaderboards computed by MySQL (PLAYER_STATS_ENGINE=sql)"""
+    batter_stats = get_batter_stats(cnx, team, season_from=season)
+    bowler_stats = get_bowler_stats(cnx, team, season_from=season)
+    for response in (batter_stats, bowler_stats):
+        if not response["status"]:
+            print(f"Player stats pushdown failed: {response['message']}")
+            return None
+
+    return {
+        "batter_analysis": batter_stats["data"],
+        "bowler_analysis": bowler_stats["data"],
+    }
+
+
+def get_players_analysis_summary(cnx, team, season):
+    """Player leaderboards from the summary tables (PLAYER_STATS_ENGINE=summary)"""
+    response = get_innings_summary(cnx, team, season_from=season)
+    if not response["status"]:
+        print(f"Innings summary read failed: {response['message']}")
+        return None
+
+    return {
+        "batter_analysis": get_batting_leaderboards(response["data"]["batter_innings"]),
+        "bowler_analysis": get_bowling_figures(response["data"]["bowler_innings"]),
+    }
+
+
+def get_score_extremes(df, innings_df, team):
+    """Highest and lowest score of a team in each toss scenario, looked up
+    from its innings totals and found with one argmax/argmin over a
+    scenario-by-match score matrix. Neither frame is modified.
+
+    Args:
+        df (pd.DataFrame): the team's matches
+        innings_df (pd.DataFrame): the team's batting innings, INNINGS_COL
+        team (str): team name
+
+    Returns:
+        tuple: highest and lowest dicts of scenario -> match row with its
+        "actual_runs" and "actual_wickets"; scenarios without a score are left out
+    """
+    if df.empty or innings_df.empty:
+        return {}, {}
+
+    # A team bats at most one regular innings per match
+    innings = innings_df.set_index("match_id")
+    position = innings.index.get_indexer(df["match_id"])
+    batted = position >= 0
+    runs = np.where(batted, innings["runs"].to_numpy()[position], np.nan)
+    wickets = innings["wickets"].to_numpy()[position]
+    batted_first = batted & (innings["inning"].to_numpy()[position] == 1)
+    batted_second = batted & ~batted_first
+    won_toss = (df["toss_winner"] == team).to_numpy()
+
+    scenarios = {
+        "toss_won_bat": won_toss & batted_first,
+        "toss_won_field": won_toss & batted_second,
+        "toss_loss_bat": ~won_toss & batted_first,
+        "toss_loss_field": ~won_toss & batted_second,
+    }
+    scores = np.stack([np.where(mask, runs, np.nan) for mask in scenarios.values()])
+    has_score = ~np.isnan(scores).all(axis=1)
+    highest_at = np.where(np.isnan(scores), -np.inf, scores).argmax(axis=1)
+    lowest_at = np.where(np.isnan(scores), np.inf, scores).argmin(axis=1)
+
+    highest, lowest = {}, {}
+    for i, name in enumerate(scenarios):
+        if has_score[i]:
+            for result, position in ((highest, highest_at[i]), (lowest, lowest_at[i])):
+                row = df.iloc[position].copy()
+                row["actual_runs"] = int(runs[position])
+                row["actual_wickets"] = int(wickets[position])
+                result[name] = row
+    return highest, lowest
+
+
+class TeamAnalysis(Mapping):
+    """Team analysis response whose sections are computed on first access
+    and then memoized, so a page only pays for the sections it shows.
+
+    Reads like the dict get_team_analysis used to return; ``in`` checks the
+    section names without computing anything.
+    """
+
+    # Section -> builder method; a builder fills in every section it returns
+    SECTIONS = {
+        "most_player_of_match": "_player_of_match",
+        "total_matches": "_matches",
+        "matches_won": "_results",
+        "matches_lost": "_results",
+        "home_away": "_home_away",
+        "season_totals": "_season_totals",
+        "highest_score": "_scores",
+        "lowest_score": "_scores",
+        "super_over_analysis": "_super_overs",
+        "final_matches_won": "_finals",
+        "final_matches": "_finals",
+        "non_final_matches": "_finals",
+        "players_analysis": "_players",
+    }
+
+    def __init__(self, cnx, team, season=None):
+        self.cnx = cnx
+        self.team = team
+        self.season = season
+        self._sections = {}
+
+    def __getitem__(self, key):
+        if key not in self._sections:
+            self._sections.update(getattr(self, self.SECTIONS[key])())
+        return self._sections[key]
+
+    def __contains__(self, key):
+        return key in self.SECTIONS
+
+    def __iter__(self):
+        return iter(self.SECTIONS)
+
+    def __len__(self):
+        return len(self.SECTIONS)
+
+    def _matches(self):
+        data = get_team_data(self.cnx, self.team, season_from=self.season)
+        df = make_frame(data["data"], MATCHES_COL)
+        df.rename(columns={"id": "match_id"}, inplace=True)
+        df.to_csv("views/team/team_analysis.csv")
+        return {"total_matches": df}
+
+    def _results(self):
+        df = self["total_matches"]
+        return {
+            "matches_won": df[df["winner"] == self.team],
+            "matches_lost": df[df["winner"] != self.team],
+        }
+
+    def _home_away(self):
+        # Home is the team's own city rather than always Bangalore; like
+        # matches_lost, a loss is any match the team did not win
+        outcomes = get_team_outcomes(
+            get_outcome_breakdown(self["total_matches"]),
+            self.team,
+            no_result_is_loss=True,
         )
-    else:
-        return (x["target_runs"] - x["result_margin"]) - 1
+        return {
+            "home_away": {
+                "home_won_by_team": outcomes["home_wins"],
+                "home_loss_by_team": outcomes["home_losses"],
+                "away_won_by_team": outcomes["away_wins"],
+                "away_loss_by_team": outcomes["away_losses"],
+            }
+        }
 
+    def _season_totals(self):
+        aggregates = get_season_aggregates()
+        totals = aggregates.team_totals(self.team, self.season) if aggregates else None
+        if totals is None:
+            totals = get_team_totals(self["total_matches"], self.team)
+        return {"season_totals": totals}
+
+    def _scores(self):
+        response = get_team_innings(self.cnx, self.team, season_from=self.season)
+        if not response["status"]:
+            print(f"Team innings fetch failed: {response['message']}")
+        innings_df = make_frame(response["data"], INNINGS_COL)
+        highest_score, lowest_score = get_score_extremes(
+            self["total_matches"], innings_df, self.team
+        )
+        return {"highest_score": highest_score, "lowest_score": lowest_score}
 
-def get_actual_score(x):
-    if x["winner"] != x["toss_winner"]:
-        return x["target_runs"] if x["result"] != "runs" else 0
-    else:
-        return x["target_runs"] - x["result_margin"] - 1 if x["result"] == "runs" else 0
+    def _super_overs(self):
+        df = self["total_matches"]
+        super_over = df["super_over"] == "Y"
+        return {
+            "super_over_analysis": {
+                "total_super_over": df[super_over],
+                "total_super_over_won": df[super_over & (df["winner"] == self.team)],
+            }
+        }
 
+    def _finals(self):
+        df = self["total_matches"]
+        final = df["match_type"] == "Final"
+        return {
+            "final_matches_won": df[final & (df["winner"] == self.team)],
+            "final_matches": df[final],
+            "non_final_matches": df[(df["match_type"] != "League") & ~final],
+        }
 
-def get_players_analysis(df, team):
-    try:
-        batter_df = df[
-            (
-                (df["toss_winner"] != team)
-                & (df["toss_decision"] == "bat")
-                & (df["inning"] == 2)
-            )
-            | (
-                (df["toss_winner"] != team)
-                & (df["toss_decision"] == "field")
-                & (df["inning"] == 1)
-            )
-            | (
-                (df["toss_winner"] == team)
-                & (df["toss_decision"] == "field")
-                & (df["inning"] == 2)
-            )
-            | (
-                (df["toss_winner"] == team)
-                & (df["toss_decision"] == "bat")
-                & (df["inning"] == 1)
+    def _player_of_match(self):
+        df = self["total_matches"]
+        return {"most_player_of_match": df["player_of_match"].value_counts()[:5]}
+
+    def _players(self):
+        # PLAYER_STATS_ENGINE picks where the player leaderboards are aggregated
+        engine = os.getenv("PLAYER_STATS_ENGINE", "pandas")
+        if engine == "sql":
+            players_analysis = get_players_analysis_sql(
+                self.cnx, self.team, self.season
             )
-        ]
-        bowler_df = df[
-            (
-                (df["toss_winner"] != team)
-                & (df["toss_decision"] == "bat")
-                & (df["inning"] == 1)
+        elif engine == "summary":
+            players_analysis = get_players_analysis_summary(
+                self.cnx, self.team, self.season
             )
-            | (
-                (df["toss_winner"] != team)
-                & (df["toss_decision"] == "field")
-                & (df["inning"] == 2)
+        else:
+            players_analysis = get_players_analysis_pandas(
+                self.cnx, self.team, self.season
             )
-            | (
-                (df["toss_winner"] == team)
-                & (df["toss_decision"] == "field")
-                & (df["inning"] == 1)
+
+        # Career leaderboards are a single read of the season aggregates
+        aggregates = get_season_aggregates()
+        if players_analysis is not None and aggregates is not None:
+            players_analysis["batter_analysis"].update(
+                get_batting_totals(
+                    aggregates.player_totals(self.team, "batting", self.season)
+                )
             )
-            | (
-                (df["toss_winner"] == team)
-                & (df["toss_decision"] == "bat")
-                & (df["inning"] == 2)
+            players_analysis["bowler_analysis"].update(
+                get_wickets_total(
+                    aggregates.player_totals(self.team, "bowling", self.season)
+                )
             )
-        ]
-
-        batter_analysis = {
-            "total_fours": get_fours_total(batter_df),
-            "fours_inning": get_four_inning(batter_df),
-            "total_sixes": get_total_sixes(batter_df),
-            "sixes_inning": get_sixes_inning(batter_df),
-            "highest_score_inning": get_highest_score_inning(batter_df),
-            "total_runs": get_total_runs(batter_df),
-            "fifties": get_fifties(batter_df),
-            "centuries": get_centuries(batter_df),
-        }
-        bowler_analysis = {
-            "wickets_total": get_bowler_wickets(bowler_df),
-            "wickets_inning": get_wicket_inning(bowler_df),
-        }
+        return {"players_analysis": players_analysis}
 
-        return {
-            "batter_analysis": batter_analysis,
-            "bowler_analysis": bowler_analysis,
-        }
-    except Exception as e:
-        print(traceback.print_exception(e))
-
-
-def get_highest_score(df, team):
-    result = {}
-
-    # Check if filtered DataFrame has rows before accessing iloc[0]
-    toss_won_bat_df = df[
-        (df["toss_winner"] == team) & (df["toss_decision"] == "bat")
-    ].sort_values(by="target_runs", ascending=False)
-    if not toss_won_bat_df.empty:
-        result["toss_won_bat"] = toss_won_bat_df.iloc[0]
-
-    df["actual_runs"] = df[
-        (df["toss_winner"] == team) & (df["toss_decision"] == "field")
-    ].apply(my_func, axis=1)
-    toss_won_field_df = df.sort_values(by="actual_runs", ascending=False)
-    if not toss_won_field_df.empty:
-        result["toss_won_field"] = toss_won_field_df.iloc[0]
-
-    toss_loss_bat_df = df[
-        (df["toss_winner"] != team)
-        & (df["toss_decision"] == "field")
-        & (df["result"] == "runs")
-    ].sort_values(by="target_runs", ascending=False)
-    if not toss_loss_bat_df.empty:
-        result["toss_loss_bat"] = toss_loss_bat_df.iloc[0]
-
-    df["actual_runs"] = df[
-        (df["toss_winner"] != team) & (df["toss_decision"] == "bat")
-    ].apply(get_actual_score, axis=1)
-    toss_loss_field_df = df.sort_values(by="actual_runs", ascending=False)
-    if not toss_loss_field_df.empty:
-        result["toss_loss_field"] = toss_loss_field_df.iloc[0]
-
-    return result
-
-
-def get_lowest_score(df, team):
-    result = {}
-
-    # Check if filtered DataFrame has rows before accessing iloc[0]
-    toss_won_bat_df = df[
-        (df["toss_winner"] == team) & (df["toss_decision"] == "bat")
-    ].sort_values(
-        by="target_runs", ascending=True
-    )  # Changed to ascending=True
-    if not toss_won_bat_df.empty:
-        result["toss_won_bat"] = toss_won_bat_df.iloc[0]
-
-    df["actual_runs"] = df[
-        (df["toss_winner"] == team) & (df["toss_decision"] == "field")
-    ].apply(my_func, axis=1)
-    toss_won_field_df = df.sort_values(by="actual_runs", ascending=True)
-    if not toss_won_field_df.empty:
-        result["toss_won_field"] = toss_won_field_df.iloc[0]
-
-    toss_loss_bat_df = df[
-        (df["toss_winner"] != team)
-        & (df["toss_decision"] == "field")
-        & (df["result"] == "runs")
-    ].sort_values(by="target_runs", ascending=True)
-    if not toss_loss_bat_df.empty:
-        result["toss_loss_bat"] = toss_loss_bat_df.iloc[0]
-
-    df["actual_runs"] = df[
-        (df["toss_winner"] != team) & (df["toss_decision"] == "bat")
-    ].apply(get_actual_score, axis=1)
-    toss_loss_field_df = df.sort_values(by="actual_runs", ascending=True)
-    if not toss_loss_field_df.empty:
-        result["toss_loss_field"] = toss_loss_field_df.iloc[0]
-
-    return result
-
-
-def get_team_analysis(cnx, team, season):
-    data = get_team_data(cnx, team)
-
-    df = pd.DataFrame(data["data"], columns=MATCHES_COL)
-    df.rename(columns={"id": "match_id"}, inplace=True)
-
-    batter_df = pd.DataFrame(get_team_players_data(), columns=PLAYERS_COL)
-    batter_df = pd.merge(df, batter_df, on="match_id")
-    batter_df = batter_df[(batter_df["team1"] == team) | (batter_df["team2"] == team)]
-
-    if season != "All Seasons":
-        df = df[df["season"] >= season]
-        batter_df = batter_df[(batter_df["season"] >= season)]
-
-    df.to_csv("views/team/team_analysis.csv")
-    batter_df.to_csv("views/team/batter_analysis.csv")
-
-    matches_won = df[df["winner"] == team]
-    matches_lost = df[df["winner"] != team]
-
-    home_won_by_team = len(df[(df["winner"] == team) & (df["city"] == "Bangalore")])
-    home_loss_by_team = len(df[(df["winner"] != team) & (df["city"] == "Bangalore")])
-    away_won_by_team = len(df[(df["winner"] == team) & (df["city"] != "Bangalore")])
-    away_loss_by_team = len(df[(df["winner"] != team) & (df["city"] != "Bangalore")])
-    home_away = {
-        "home_won_by_team": home_won_by_team,
-        "home_loss_by_team": home_loss_by_team,
-        "away_won_by_team": away_won_by_team,
-        "away_loss_by_team": away_loss_by_team,
-    }
 
-    toss_won = df[df["toss_winner"] == team]
-    toss_won_match_won = df[(df["toss_winner"] == team) & (df["winner"] == team)]
-    toss_loss_match_won = df[(df["toss_winner"] != team) & (df["winner"] == team)]
-    toss_analysis = {
-        "toss_won": toss_won,
-        "toss_won_match_won": toss_won_match_won,
-        "toss_loss_match_won": toss_loss_match_won,
-    }
+def get_team_analysis(cnx, team, season=None):
+    """Team analysis for the team page
 
-    total_super_over = df[(df["super_over"] == "Y")]
-    total_super_over_won = df[(df["super_over"] == "Y") & (df["winner"] == team)]
-    super_over_analysis = {
-        "total_super_over": total_super_over,
-        "total_super_over_won": total_super_over_won,
-    }
+    Args:
+        cnx (ConnectionPool): connection pool
+        team (str): team name
+        season (int): earliest season key to include, None for every season
 
-    final_matches = df[(df["match_type"] != "League") & (df["match_type"] == "Final")]
-    final_matches_won = df[
-        (df["match_type"] != "League")
-        & (df["match_type"] == "Final")
-        & (df["winner"] == team)
-    ]
-    non_final_matches = df[
-        (df["match_type"] != "League") & (df["match_type"] != "Final")
-    ]
-
-    most_player_of_match = df["player_of_match"].value_counts()[:5]
-
-    team_response = {
-        "most_player_of_match": most_player_of_match,
-        "total_matches": df,
-        "matches_won": matches_won,
-        "matches_lost": matches_lost,
-        "home_away": home_away,
-        "toss_analysis": toss_analysis,
-        "highest_score": get_highest_score(df, team),
-        "lowest_score": get_lowest_score(df, team),
-        "super_over_analysis": super_over_analysis,
-        "final_matches_won": final_matches_won,
-        "final_matches": final_matches,
-        "non_final_matches": non_final_matches,
-        "players_analysis": get_players_analysis(batter_df, team),
-    }
-    return team_response
+    Returns:
+        TeamAnalysis: lazily computed response sections
+    """
+    return TeamAnalysis(cnx, team, season)
@@ -1,110 +1,155 @@
 import pandas as pd
 
-
-def get_fours_total(batter_df):
-    fours_total = (
-        batter_df[batter_df["batsman_runs"] == 4]
-        .groupby(["batter"])["batsman_runs"]
-        .count()
-        .reset_index()
+LEADERBOARD_SIZE = 10
+
+
+def get_batter_innings(batter_df):
+    """Batter-by-match table built in one grouped pass over deliveries
+
+    Args:
+        batter_df (pd.DataFrame): deliveries faced by the team's batters
+
+    Returns:
+        pd.DataFrame: batter, match_id, runs, balls, fours, sixes
+    """
+    runs = batter_df["batsman_runs"]
+    counts = pd.DataFrame(
+        {
+            "batter": batter_df["batter"],
+            "match_id": batter_df["match_id"],
+            "runs": runs,
+            "balls": batter_df["extras_type"] != "wides",
+            "fours": runs == 4,
+            "sixes": runs == 6,
+        }
     )
-    fours_total = fours_total.sort_values(by="batsman_runs", ascending=False).head(10)
-    fours_total.rename(columns={"batsman_runs": "total_fours"}, inplace=True)
-    return fours_total
+    return counts.groupby(["batter", "match_id"], as_index=False, observed=True).sum()
 
 
-def get_four_inning(batter_df):
-    four_inning = (
-        batter_df[batter_df["batsman_runs"] == 4]
-        .groupby(["batter", "match_id"])["batsman_runs"]
-        .count()
-        .reset_index()
-    )
-    four_inning = four_inning.sort_values(by="batsman_runs", ascending=False).head(10)
-    four_inning.rename(columns={"batsman_runs": "total_fours"}, inplace=True)
-    return four_inning
+def fold_batter_innings(partial, innings_df):
+    """Fold a chunk of the batter-by-match table into a bounded partial:
+    career totals per batter, plus at most 3 * LEADERBOARD_SIZE innings
+    that can still reach a leaderboard. Chunks must hold whole matches.
 
+    Args:
+        partial (dict): previous fold result, or None for the first chunk
+        innings_df (pd.DataFrame): batter, match_id, runs, balls, fours, sixes
 
-def get_total_sixes(batter_df):
-    sixes_total = (
-        batter_df[batter_df["batsman_runs"] == 6]
-        .groupby(["batter"])["batsman_runs"]
-        .count()
-        .reset_index()
+    Returns:
+        dict: "career" and "innings" frames for get_batting_leaderboards_from
+    """
+    runs = innings_df["runs"]
+    career = innings_df[["batter", "runs", "fours", "sixes"]].assign(
+        fifties=(runs >= 50) & (runs < 100), centuries=runs >= 100
     )
-    sixes_total = sixes_total.sort_values(by="batsman_runs", ascending=False).head(10)
-    sixes_total.rename(columns={"batsman_runs": "total_sixes"}, inplace=True)
-    return sixes_total
+    innings = innings_df[["batter", "match_id", "runs", "balls", "fours", "sixes"]]
+    if partial is not None:
+        career = pd.concat([partial["career"], career], ignore_index=True)
+        innings = pd.concat([partial["innings"], innings], ignore_index=True)
+
+    # The leaderboards take the first rows of stable sorts over this order,
+    # so the first LEADERBOARD_SIZE per column are all that can still appear
+    innings = innings.sort_values(["batter", "match_id"], ignore_index=True)
+    leaders = [
+        innings[col].sort_values(ascending=False, kind="stable").index
+        for col in ("runs", "fours", "sixes")
+    ]
+    rows = leaders[0][:LEADERBOARD_SIZE]
+    for index in leaders[1:]:
+        rows = rows.union(index[:LEADERBOARD_SIZE])
+    return {
+        "career": career.groupby("batter", as_index=False, observed=True).sum(),
+        "innings": innings.loc[rows].reset_index(drop=True),
+    }
 
 
-def get_sixes_inning(batter_df):
-    sixes_inning = (
-        batter_df[batter_df["batsman_runs"] == 6]
-        .groupby(["batter", "match_id"])["batsman_runs"]
-        .count()
-        .reset_index()
-    )
-    sixes_inning = sixes_inning.sort_values(by="batsman_runs", ascending=False).head(10)
-    sixes_inning.rename(columns={"batsman_runs": "total_sixes"}, inplace=True)
-    return sixes_inning
+def get_batting_leaderboards(innings_df):
+    """Batting leaderboards from a batter-by-match table
 
+    Args:
+        innings_df (pd.DataFrame): batter, match_id, runs, balls, fours, sixes
 
-def get_highest_score_inning(batter_df):
-    highest_score = batter_df.groupby(["batter"])["batsman_runs"].sum().reset_index()
-    highest_score_sorted = highest_score.sort_values(
-        by="batsman_runs", ascending=False
-    ).head(10)
-    return highest_score_sorted
+    Returns:
+        dict: leaderboards shaped like the functions above
+    """
+    return get_batting_leaderboards_from(fold_batter_innings(None, innings_df))
 
 
-def get_total_runs(batter_df):
-    highest_score = (
-        batter_df.groupby(["batter", "match_id"])["batsman_runs"].sum().reset_index()
-    )
-    highest_score_sorted = highest_score.sort_values(
-        by="batsman_runs", ascending=False
-    ).head(10)
-
-    balls_faced = (
-        batter_df[(batter_df.extras_type != "wides")]
-        .groupby(["match_id", "batter"])["ball"]
-        .count()
-        .reset_index()
-    )
-    highest_score_with_balls = pd.merge(
-        highest_score_sorted, balls_faced, on=["batter", "match_id"], how="left"
-    )
-    highest_score_with_balls["strike_rate"] = round(
-        (highest_score_with_balls["batsman_runs"] / highest_score_with_balls["ball"])
-        * 100,
-        2,
-    )
-    return highest_score_with_balls
+def get_batting_leaderboards_from(partial):
+    """Batting leaderboards from a fold_batter_innings partial. Tied rows
+    rank in batter then match_id order, so which of them make the top
+    LEADERBOARD_SIZE does not depend on how the deliveries were chunked.
+
+    Args:
+        partial (dict): "career" and "innings" frames
 
+    Returns:
+        dict: leaderboards shaped like the functions above
+    """
+    career, innings_df = partial["career"], partial["innings"]
 
-def get_fifties(batter_df):
-    fifty_scored = (
-        batter_df.groupby(["batter", "match_id"])["batsman_runs"].sum().reset_index()
+    innings_runs = innings_df[["batter", "match_id", "runs"]].rename(
+        columns={"runs": "batsman_runs"}
     )
-    fifty_scored_sorted = fifty_scored[
-        (fifty_scored.batsman_runs >= 50) & (fifty_scored.batsman_runs < 100)
-    ]
-    fifty_scored_sorted = (
-        fifty_scored_sorted.groupby("batter", as_index=False)
-        .count()
-        .sort_values("batsman_runs", ascending=False)
+    total_runs = innings_runs.sort_values(
+        by="batsman_runs", ascending=False, kind="stable"
+    ).head(LEADERBOARD_SIZE)
+    total_runs = total_runs.merge(
+        innings_df[["batter", "match_id", "balls"]], on=["batter", "match_id"]
+    ).rename(columns={"balls": "ball"})
+    if (total_runs["ball"] == 0).any():
+        # Innings made only of wides have no balls faced
+        total_runs["ball"] = total_runs["ball"].where(total_runs["ball"] > 0)
+    total_runs["strike_rate"] = round(
+        (total_runs["batsman_runs"] / total_runs["ball"]) * 100, 2
     )
-    return fifty_scored_sorted
-
 
-def get_centuries(batter_df):
-    century_scored = (
-        batter_df.groupby(["batter", "match_id"])["batsman_runs"].sum().reset_index()
-    )
-    century_scored_sorted = century_scored[(century_scored.batsman_runs >= 100)]
-    century_scored_sorted = (
-        century_scored_sorted.groupby("batter", as_index=False)
-        .count()
-        .sort_values("batsman_runs", ascending=False)
+    def milestones(column):
+        counts = career.loc[career[column] > 0, ["batter", column]]
+        return pd.DataFrame(
+            {
+                "batter": counts["batter"],
+                "match_id": counts[column],
+                "batsman_runs": counts[column],
+            }
+        ).sort_values("batsman_runs", ascending=False, kind="stable")
+
+    return {
+        **get_batting_totals(career),
+        "fours_inning": _top(
+            innings_df[["batter", "match_id", "fours"]], "fours", "total_fours"
+        ),
+        "sixes_inning": _top(
+            innings_df[["batter", "match_id", "sixes"]], "sixes", "total_sixes"
+        ),
+        "total_runs": total_runs,
+        "fifties": milestones("fifties"),
+        "centuries": milestones("centuries"),
+    }
+
+
+def get_batting_totals(career):
+    """Career leaderboards from per-batter totals, either a fold's career
+    frame or SeasonAggregates.player_totals
+
+    Args:
+        career (pd.DataFrame): batter, runs, fours, sixes
+
+    Returns:
+        dict: "total_fours", "total_sixes" and "highest_score_inning"
+    """
+    return {
+        "total_fours": _top(career[["batter", "fours"]], "fours", "total_fours"),
+        "total_sixes": _top(career[["batter", "sixes"]], "sixes", "total_sixes"),
+        "highest_score_inning": career[["batter", "runs"]]
+        .rename(columns={"runs": "batsman_runs"})
+        .sort_values(by="batsman_runs", ascending=False, kind="stable")
+        .head(LEADERBOARD_SIZE),
+    }
+
+
+def _top(df, column, name):
+    df = df[df[column] > 0].rename(columns={column: name})
+    return df.sort_values(by=name, ascending=False, kind="stable").head(
+        LEADERBOARD_SIZE
     )
-    return century_scored_sorted
@@ -1,85 +1,154 @@
 import pandas as pd
 
+from .batter import LEADERBOARD_SIZE
 
-def get_bowler_wickets(bowler_df):
-    wickets_total = (
-        bowler_df[
-            (bowler_df["is_wicket"] == 1) & (bowler_df.dismissal_kind != "run out")
-        ]
-        .groupby(["bowler"])["is_wicket"]
-        .count()
-        .reset_index()
-    )
-    wickets_total.rename(columns={"is_wicket": "total_wickets"}, inplace=True)
+# Wides and no-balls do not count towards a bowler's overs
+ILLEGAL_DELIVERIES = ["wides", "noballs"]
 
-    runs_conceded = bowler_df.groupby(["bowler"])["total_runs"].sum().reset_index()
+# Best figures in an innings: most wickets, then fewest runs conceded
+BEST_FIGURES = (["wickets", "runs_conceded"], [False, True])
 
-    balls_bowled = (
-        bowler_df[bowler_df.extras_type.isnull()]
-        .groupby(["bowler"])["ball"]
-        .count()
-        .reset_index()
-    )
-    balls_bowled["overs"] = balls_bowled["ball"] // 6 + (balls_bowled["ball"] % 6) / 10
-    balls_bowled.rename(columns={"ball": "total_balls"}, inplace=True)
+# Innings with this many wickets are listed in full as wicket hauls
+HAUL_WICKETS = 4
 
-    wickets_runs_balls = pd.merge(
-        wickets_total, runs_conceded, on=["bowler"], how="left"
-    )
-    wickets_runs_balls = pd.merge(
-        wickets_runs_balls, balls_bowled, on=["bowler"], how="left"
-    )
-    wickets_runs_balls["strike_rate"] = round(
-        wickets_runs_balls["total_runs"] / wickets_runs_balls["total_wickets"], 2
-    )
-    wickets_runs_balls["economy_rate"] = round(
-        wickets_runs_balls["total_runs"] / wickets_runs_balls["overs"], 2
-    )
+# Innings and career frames -> figures columns
+FIGURES_RENAME = {
+    "wickets": "total_wickets",
+    "runs_conceded": "total_runs",
+    "legal_balls": "total_balls",
+}
 
-    wickets_runs_balls_sorted = wickets_runs_balls.sort_values(
-        by=["total_wickets", "economy_rate"], ascending=[False, True]
-    )
-    return wickets_runs_balls_sorted
+FIGURES_COLUMNS = [
+    "total_wickets",
+    "total_runs",
+    "total_balls",
+    "overs",
+    "strike_rate",
+    "economy_rate",
+]
 
 
-def get_wicket_inning(bowler_df):
-    wickets_total = (
-        bowler_df[
-            (bowler_df["is_wicket"] == 1) & (bowler_df["dismissal_kind"] != "run out")
-        ]
-        .groupby(["bowler", "match_id"])["is_wicket"]
-        .count()
-        .reset_index()
-    )
-    wickets_total.rename(columns={"is_wicket": "total_wickets"}, inplace=True)
+def get_bowler_innings(bowler_df):
+    """Bowler-by-match table built in one grouped pass over deliveries
 
-    runs_conceded = (
-        bowler_df.groupby(["bowler", "match_id"])["total_runs"].sum().reset_index()
-    )
+    Args:
+        bowler_df (pd.DataFrame): deliveries bowled by the team's bowlers
 
-    balls_bowled = (
-        bowler_df[bowler_df.extras_type.isnull()]
-        .groupby(["bowler", "match_id"])["ball"]
-        .count()
-        .reset_index()
+    Returns:
+        pd.DataFrame: bowler, match_id, legal_balls, runs_conceded, wickets
+    """
+    counts = pd.DataFrame(
+        {
+            "bowler": bowler_df["bowler"],
+            "match_id": bowler_df["match_id"],
+            "legal_balls": ~bowler_df["extras_type"].isin(ILLEGAL_DELIVERIES),
+            "runs_conceded": bowler_df["total_runs"],
+            "wickets": (bowler_df["is_wicket"] == 1)
+            & (bowler_df["dismissal_kind"] != "run out"),
+        }
     )
-    balls_bowled["overs"] = balls_bowled["ball"] // 6 + (balls_bowled["ball"] % 6) / 10
-    balls_bowled.rename(columns={"ball": "total_balls"}, inplace=True)
+    return counts.groupby(["bowler", "match_id"], as_index=False, observed=True).sum()
 
-    wickets_runs_balls = pd.merge(
-        wickets_total, runs_conceded, on=["bowler", "match_id"], how="left"
-    )
-    wickets_runs_balls = pd.merge(
-        wickets_runs_balls, balls_bowled, on=["bowler", "match_id"], how="left"
-    )
-    wickets_runs_balls["strike_rate"] = round(
-        wickets_runs_balls["total_runs"] / wickets_runs_balls["total_wickets"], 2
+
+def fold_bowler_innings(partial, innings_df):
+    """Fold a chunk of the bowler-by-match table into a bounded partial:
+    career totals per bowler, the LEADERBOARD_SIZE innings with the best
+    figures so far and every wicket haul. Chunks must hold whole matches.
+
+    Args:
+        partial (dict): previous fold result, or None for the first chunk
+        innings_df (pd.DataFrame): bowler, match_id, legal_balls, runs_conceded, wickets
+
+    Returns:
+        dict: "career" and "innings" frames for get_bowling_figures_from
+    """
+    career = innings_df[["bowler", "legal_balls", "runs_conceded", "wickets"]]
+    innings = innings_df[innings_df["wickets"] > 0]
+    if partial is not None:
+        career = pd.concat([partial["career"], career], ignore_index=True)
+        innings = pd.concat([partial["innings"], innings], ignore_index=True)
+
+    # As in fold_batter_innings: only the first LEADERBOARD_SIZE of a stable
+    # sort over the bowler and match order can still appear
+    innings = innings.sort_values(["bowler", "match_id"], ignore_index=True)
+    by, ascending = BEST_FIGURES
+    best = innings.sort_values(by, ascending=ascending, kind="stable").index
+    rows = best[:LEADERBOARD_SIZE].union(
+        innings.index[innings["wickets"] >= HAUL_WICKETS]
     )
-    wickets_runs_balls["economy_rate"] = round(
-        wickets_runs_balls["total_runs"] / wickets_runs_balls["overs"], 2
+    return {
+        "career": career.groupby("bowler", as_index=False, observed=True).sum(),
+        "innings": innings.loc[rows].reset_index(drop=True),
+    }
+
+
+def get_bowling_figures(innings_df):
+    """Bowling figures from a bowler-by-match table
+
+    Args:
+        innings_df (pd.DataFrame): bowler, match_id, legal_balls, runs_conceded, wickets
+
+    Returns:
+        dict: "wickets_total" per bowler, "wickets_inning", the
+        LEADERBOARD_SIZE best figures in an innings, and "wicket_hauls",
+        every innings with at least HAUL_WICKETS wickets
+    """
+    return get_bowling_figures_from(fold_bowler_innings(None, innings_df))
+
+
+def get_bowling_figures_from(partial):
+    """Bowling figures from a fold_bowler_innings partial. Strike rate is
+    balls per wicket and economy rate is runs per six legal balls.
+
+    Args:
+        partial (dict): "career" and "innings" frames
+
+    Returns:
+        dict: "wickets_total" per bowler, "wickets_inning", the
+        LEADERBOARD_SIZE best figures in an innings, and "wicket_hauls",
+        every innings with at least HAUL_WICKETS wickets
+    """
+    best_by = [FIGURES_RENAME[col] for col in BEST_FIGURES[0]]
+    innings = _figures(
+        partial["innings"].rename(columns=FIGURES_RENAME),
+        ["bowler", "match_id"],
+        best_by,
     )
+    return {
+        **get_wickets_total(partial["career"]),
+        "wickets_inning": innings.head(LEADERBOARD_SIZE),
+        "wicket_hauls": innings[innings["total_wickets"] >= HAUL_WICKETS],
+    }
+
+
+def get_wickets_total(career):
+    """Career wickets leaderboard from per-bowler totals, either a fold's
+    career frame or SeasonAggregates.player_totals
+
+    Args:
+        career (pd.DataFrame): bowler, legal_balls, runs_conceded, wickets
 
-    wickets_runs_balls_sorted = wickets_runs_balls.sort_values(
-        by=["total_wickets", "economy_rate"], ascending=[False, True]
+    Returns:
+        dict: "wickets_total" per bowler
+    """
+    return {
+        "wickets_total": _figures(
+            career.rename(columns=FIGURES_RENAME),
+            ["bowler"],
+            ["total_wickets", "economy_rate"],
+        )
+    }
+
+
+def _figures(df, keys, order):
+    df = df[df["total_wickets"] > 0]
+    balls = df["total_balls"].where(df["total_balls"] > 0)
+    df = df.assign(
+        # Cricket notation for display only, e.g. 3.4 is 22 balls
+        overs=df["total_balls"] // 6 + (df["total_balls"] % 6) / 10,
+        strike_rate=round(balls / df["total_wickets"], 2),
+        economy_rate=round(df["total_runs"] * 6 / balls, 2),
+    )
+    return df[keys + FIGURES_COLUMNS].sort_values(
+        by=order, ascending=[False, True], kind="stable"
     )
-    return wickets_runs_balls_sorted